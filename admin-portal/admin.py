@@ -7,9 +7,27 @@ Run with: streamlit run admin.py
 
 import streamlit as st
 from datetime import datetime, timedelta
+import heapq
 import json
 import os
 
+# orjson parses/serializes several times faster than stdlib json; fall
+# back to stdlib if it isn't installed.
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(data):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(data):
+        return json.dumps(data, indent=2, default=str).encode('utf-8')
+
 # Import theme
 from theme import apply_theme, sidebar_branding, metric_card, section_header, COLORS
 
@@ -24,8 +42,73 @@ DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
 os.makedirs(DATA_DIR, exist_ok=True)
 
 POSTS_FILE = os.path.join(DATA_DIR, 'posts.json')
+POSTS_JSONL = os.path.join(DATA_DIR, 'posts.jsonl')
 ACCOUNTS_FILE = os.path.join(DATA_DIR, 'accounts.json')
 MEMBERS_FILE = os.path.join(DATA_DIR, 'founding_members.json')
+MEMBERS_JSONL = os.path.join(DATA_DIR, 'founding_members.jsonl')
+STATS_FILE = os.path.join(DATA_DIR, 'stats.json')
+
+
+def _mtime(path):
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+
+# ===== Precomputed HTML Templates =====
+# Color constants are baked in once at import instead of re-interpolating
+# COLORS inside every card f-string on every rerun.
+_ACTION_CARD_TMPL = f"""
+<div class="premium-card" style="text-align: center; padding: 25px;{{extra_style}}">
+    <div style="font-size: 2rem; margin-bottom: 10px;">{{icon}}</div>
+    <div style="color: {COLORS['text_primary']}; font-weight: 600; margin-bottom: 5px;">
+        {{title}}
+    </div>
+    <div style="color: {{subtitle_color}}; font-size: 0.85rem;">
+        {{subtitle}}
+    </div>
+</div>
+"""
+
+_REMINDER_CARD_TMPL = f"""
+<div class="premium-card">
+    <div style="display: flex; justify-content: space-between; align-items: center;">
+        <div>
+            <div style="color: {COLORS['text_muted']}; font-size: 0.8rem; text-transform: uppercase;
+                        letter-spacing: 1px;">{{platform}}</div>
+            <div style="color: {COLORS['text_primary']}; font-size: 1.1rem; margin-top: 5px;">
+                Last post: <strong>{{days_ago}}</strong> {{suffix}}
+            </div>
+        </div>
+        <div style="width: 12px; height: 12px; background: {{status_color}}; border-radius: 50%;
+                    box-shadow: 0 0 10px {{status_color}};"></div>
+    </div>
+    <div style="color: {COLORS['text_muted']}; font-size: 0.85rem; margin-top: 10px;">
+        {{message}}
+    </div>
+</div>
+"""
+
+_STATUS_COLORS = {
+    'good': COLORS['positive'],
+    'warning': COLORS['warning'],
+    'danger': COLORS['negative'],
+}
+
+_STATUS_MESSAGES = {
+    'good': "Great job staying active!",
+    'warning': "Consider posting soon!",
+    'danger': "Time to post!",
+}
+
+
+@st.cache_resource(show_spinner=False)
+def _load_json_cached(filepath, mtime):
+    """Read and parse a JSON file. Cached on (path, mtime) so the disk
+    read and parse only happen when the file actually changed.
+
+    cache_resource returns the one live object with no per-access
+    copy or content hash; callers must treat it as read-only."""
+    with open(filepath, 'rb') as f:
+        return _json_loads(f.read())
 
 
 def load_json(filepath, default=None):
@@ -33,21 +116,79 @@ def load_json(filepath, default=None):
     if default is None:
         default = []
     if os.path.exists(filepath):
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        return _load_json_cached(filepath, os.path.getmtime(filepath))
     return default
 
 
+@st.cache_resource(show_spinner=False)
+def _load_posts_enriched(json_mtime, jsonl_mtime):
+    """Load posts from the legacy posts.json array plus the append-only
+    posts.jsonl log, with a parsed `_date` datetime attached to each
+    entry so reruns never repeat datetime.fromisoformat.
+
+    cache_resource (not cache_data) so the list isn't re-hashed and
+    re-pickled on every access; callers must treat it as read-only."""
+    posts = []
+    if json_mtime is not None:
+        posts = list(_load_json_cached(POSTS_FILE, json_mtime))
+    if jsonl_mtime is not None:
+        with open(POSTS_JSONL, 'rb') as f:
+            posts.extend(_json_loads(line) for line in f if line.strip())
+    for p in posts:
+        try:
+            p['_date'] = datetime.fromisoformat(p.get('date', ''))
+        except (TypeError, ValueError):
+            p['_date'] = datetime(2000, 1, 1)
+    return posts
+
+
+def load_posts():
+    """Load posts with precomputed `_date` fields."""
+    return _load_posts_enriched(_mtime(POSTS_FILE), _mtime(POSTS_JSONL))
+
+
+@st.cache_resource(show_spinner=False)
+def _load_members_merged(json_mtime, jsonl_mtime):
+    """Load founding members from the compacted archive plus any
+    appended to the JSONL log since — same scheme as load_posts, so the
+    dashboard counts members added on the Founding Members page before
+    its next compaction. Callers must treat the list as read-only."""
+    members = []
+    if json_mtime is not None:
+        members = list(_load_json_cached(MEMBERS_FILE, json_mtime))
+    if jsonl_mtime is not None:
+        with open(MEMBERS_JSONL, 'rb') as f:
+            members.extend(_json_loads(line) for line in f if line.strip())
+    return members
+
+
+def load_members():
+    """Load founding members (archive + append log)."""
+    return _load_members_merged(_mtime(MEMBERS_FILE), _mtime(MEMBERS_JSONL))
+
+
 def save_json(filepath, data):
-    """Save JSON data to file."""
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+    """Save JSON data to file.
+
+    Serialized once and written to a temp file, then swapped in with
+    os.replace: one buffered write instead of many small ones, and a
+    crash mid-write can never leave a torn file behind."""
+    tmp = filepath + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_json_dumps(data))
+    os.replace(tmp, filepath)
+    _load_json_cached.clear()
+    _load_posts_enriched.clear()
+    _load_members_merged.clear()
 
 
 # ===== Load Data =====
-posts = load_json(POSTS_FILE, [])
+posts = load_posts()
 accounts = load_json(ACCOUNTS_FILE, [])
-founding_members = load_json(MEMBERS_FILE, [])
+founding_members = load_members()
+# Derived stats sidecar maintained incrementally by the generator pages;
+# lets the totals below come from O(1) lookups instead of full scans.
+stats_sidecar = load_json(STATS_FILE, {})
 
 
 # ===== Main Content =====
@@ -62,9 +203,31 @@ st.markdown(f"""
 # ===== Quick Stats =====
 col1, col2, col3, col4 = st.columns(4)
 
-# Calculate stats
-posts_this_week = len([p for p in posts if datetime.fromisoformat(p.get('date', '2000-01-01')) > datetime.now() - timedelta(days=7)])
-total_posts = len(posts)
+# Calculate stats in a single pass over posts: week count, latest post
+# per platform, and a size-5 min-heap of the most recent posts, instead
+# of separate comprehensions and a full sort.
+now = datetime.now()
+week_cutoff = now - timedelta(days=7)
+posts_this_week = 0
+top5 = []
+twitter_max_date = reddit_max_date = ''
+for i, p in enumerate(posts):
+    date_str = p.get('date', '')
+    if p['_date'] > week_cutoff:
+        posts_this_week += 1
+    platform = p.get('platform')
+    if platform == 'twitter':
+        twitter_max_date = max(twitter_max_date, date_str)
+    elif platform == 'reddit':
+        reddit_max_date = max(reddit_max_date, date_str)
+    entry = (date_str, i, p)
+    if len(top5) < 5:
+        heapq.heappush(top5, entry)
+    else:
+        heapq.heappushpop(top5, entry)
+recent_posts = [e[2] for e in sorted(top5, reverse=True)]
+
+total_posts = stats_sidecar.get('total_posts') or len(posts)
 active_accounts = len([a for a in accounts if a.get('active', True)])
 
 with col1:
@@ -88,63 +251,47 @@ section_header("Quick Actions", "Jump to common tasks")
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    st.markdown(f"""
-    <div class="premium-card" style="text-align: center; padding: 25px;">
-        <div style="font-size: 2rem; margin-bottom: 10px;">𝕏</div>
-        <div style="color: {COLORS['text_primary']}; font-weight: 600; margin-bottom: 5px;">
-            Create X Post
-        </div>
-        <div style="color: {COLORS['text_muted']}; font-size: 0.85rem;">
-            Generate trade alerts, educational content, or track record updates
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_ACTION_CARD_TMPL.format_map({
+        'extra_style': '',
+        'icon': '𝕏',
+        'title': 'Create X Post',
+        'subtitle': 'Generate trade alerts, educational content, or track record updates',
+        'subtitle_color': COLORS['text_muted'],
+    }), unsafe_allow_html=True)
     if st.button("Go to X", key="x_btn", use_container_width=True):
         st.switch_page("pages/1_X_Generator.py")
 
 with col2:
-    st.markdown(f"""
-    <div class="premium-card" style="text-align: center; padding: 25px;">
-        <div style="font-size: 2rem; margin-bottom: 10px;">📝</div>
-        <div style="color: {COLORS['text_primary']}; font-weight: 600; margin-bottom: 5px;">
-            Create Reddit Post
-        </div>
-        <div style="color: {COLORS['text_muted']}; font-size: 0.85rem;">
-            Longer-form thesis posts for r/options, r/biotechplays
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_ACTION_CARD_TMPL.format_map({
+        'extra_style': '',
+        'icon': '📝',
+        'title': 'Create Reddit Post',
+        'subtitle': 'Longer-form thesis posts for r/options, r/biotechplays',
+        'subtitle_color': COLORS['text_muted'],
+    }), unsafe_allow_html=True)
     if st.button("Go to Reddit", key="reddit_btn", use_container_width=True):
         st.switch_page("pages/2_Reddit_Generator.py")
 
 with col3:
-    st.markdown(f"""
-    <div class="premium-card" style="text-align: center; padding: 25px;">
-        <div style="font-size: 2rem; margin-bottom: 10px;">📅</div>
-        <div style="color: {COLORS['text_primary']}; font-weight: 600; margin-bottom: 5px;">
-            View Schedule
-        </div>
-        <div style="color: {COLORS['text_muted']}; font-size: 0.85rem;">
-            Check your posting calendar and upcoming reminders
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_ACTION_CARD_TMPL.format_map({
+        'extra_style': '',
+        'icon': '📅',
+        'title': 'View Schedule',
+        'subtitle': 'Check your posting calendar and upcoming reminders',
+        'subtitle_color': COLORS['text_muted'],
+    }), unsafe_allow_html=True)
     if st.button("Go to Schedule", key="schedule_btn", use_container_width=True):
         st.switch_page("pages/4_Posting_Schedule.py")
 
 with col4:
     spots_remaining = 100 - active_founding
-    st.markdown(f"""
-    <div class="premium-card" style="text-align: center; padding: 25px; border: 1px solid {COLORS['gold']}40;">
-        <div style="font-size: 2rem; margin-bottom: 10px;">🏆</div>
-        <div style="color: {COLORS['text_primary']}; font-weight: 600; margin-bottom: 5px;">
-            Founding Members
-        </div>
-        <div style="color: {COLORS['gold']}; font-size: 0.85rem;">
-            {spots_remaining} spots remaining
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_ACTION_CARD_TMPL.format_map({
+        'extra_style': f" border: 1px solid {COLORS['gold']}40;",
+        'icon': '🏆',
+        'title': 'Founding Members',
+        'subtitle': f'{spots_remaining} spots remaining',
+        'subtitle_color': COLORS['gold'],
+    }), unsafe_allow_html=True)
     if st.button("View Members", key="members_btn", use_container_width=True):
         st.switch_page("pages/5_Founding_Members.py")
 
@@ -154,13 +301,13 @@ st.markdown("<br><br>", unsafe_allow_html=True)
 section_header("Recent Activity", "Your latest posts and actions")
 
 if posts:
-    recent_posts = sorted(posts, key=lambda x: x.get('date', ''), reverse=True)[:5]
-
+    # One st.markdown for all cards instead of one call per post
+    card_parts = []
     for post in recent_posts:
         platform_emoji = "🐦" if post.get('platform') == 'twitter' else "📝"
         status_color = COLORS['positive'] if post.get('status') == 'posted' else COLORS['warning']
 
-        st.markdown(f"""
+        card_parts.append(f"""
         <div style="background: {COLORS['bg_card']}; border: 1px solid {COLORS['steel']};
                     border-radius: 8px; padding: 15px; margin-bottom: 10px;">
             <div style="display: flex; justify-content: space-between; align-items: center;">
@@ -182,7 +329,8 @@ if posts:
                 </div>
             </div>
         </div>
-        """, unsafe_allow_html=True)
+        """)
+    st.markdown("\n".join(card_parts), unsafe_allow_html=True)
 else:
     st.markdown(f"""
     <div style="background: {COLORS['bg_card']}; border: 1px solid {COLORS['steel']};
@@ -198,73 +346,43 @@ st.markdown("<br><br>", unsafe_allow_html=True)
 # ===== Posting Reminders =====
 section_header("Posting Reminders", "Stay consistent with your content")
 
-# Calculate days since last post per platform
-twitter_posts = [p for p in posts if p.get('platform') == 'twitter']
-reddit_posts = [p for p in posts if p.get('platform') == 'reddit']
+# Days since last post per platform; prefer the sidecar's O(1) dates,
+# falling back to the aggregation pass for pre-sidecar histories.
+last_dates = stats_sidecar.get('last_date_by_platform', {})
+twitter_last = last_dates.get('twitter') or twitter_max_date
+reddit_last = last_dates.get('reddit') or reddit_max_date
 
 col1, col2 = st.columns(2)
 
 with col1:
-    if twitter_posts:
-        last_twitter = max(twitter_posts, key=lambda x: x.get('date', ''))
-        last_date = datetime.fromisoformat(last_twitter.get('date', '2000-01-01'))
-        days_ago = (datetime.now() - last_date).days
+    days_ago = (now - datetime.fromisoformat(twitter_last)).days if twitter_last else None
+    if days_ago is not None:
         status = "good" if days_ago <= 2 else "warning" if days_ago <= 5 else "danger"
     else:
-        days_ago = "Never"
         status = "danger"
 
-    status_color = COLORS['positive'] if status == "good" else COLORS['warning'] if status == "warning" else COLORS['negative']
-
-    st.markdown(f"""
-    <div class="premium-card">
-        <div style="display: flex; justify-content: space-between; align-items: center;">
-            <div>
-                <div style="color: {COLORS['text_muted']}; font-size: 0.8rem; text-transform: uppercase;
-                            letter-spacing: 1px;">X</div>
-                <div style="color: {COLORS['text_primary']}; font-size: 1.1rem; margin-top: 5px;">
-                    Last post: <strong>{days_ago}</strong> {"days ago" if isinstance(days_ago, int) else ""}
-                </div>
-            </div>
-            <div style="width: 12px; height: 12px; background: {status_color}; border-radius: 50%;
-                        box-shadow: 0 0 10px {status_color};"></div>
-        </div>
-        <div style="color: {COLORS['text_muted']}; font-size: 0.85rem; margin-top: 10px;">
-            {"Great job staying active!" if status == "good" else "Consider posting soon!" if status == "warning" else "Time to post!"}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_REMINDER_CARD_TMPL.format_map({
+        'platform': 'X',
+        'days_ago': days_ago if days_ago is not None else "Never",
+        'suffix': "days ago" if days_ago is not None else "",
+        'status_color': _STATUS_COLORS[status],
+        'message': _STATUS_MESSAGES[status],
+    }), unsafe_allow_html=True)
 
 with col2:
-    if reddit_posts:
-        last_reddit = max(reddit_posts, key=lambda x: x.get('date', ''))
-        last_date = datetime.fromisoformat(last_reddit.get('date', '2000-01-01'))
-        days_ago = (datetime.now() - last_date).days
+    days_ago = (now - datetime.fromisoformat(reddit_last)).days if reddit_last else None
+    if days_ago is not None:
         status = "good" if days_ago <= 7 else "warning" if days_ago <= 14 else "danger"
     else:
-        days_ago = "Never"
         status = "danger"
 
-    status_color = COLORS['positive'] if status == "good" else COLORS['warning'] if status == "warning" else COLORS['negative']
-
-    st.markdown(f"""
-    <div class="premium-card">
-        <div style="display: flex; justify-content: space-between; align-items: center;">
-            <div>
-                <div style="color: {COLORS['text_muted']}; font-size: 0.8rem; text-transform: uppercase;
-                            letter-spacing: 1px;">Reddit</div>
-                <div style="color: {COLORS['text_primary']}; font-size: 1.1rem; margin-top: 5px;">
-                    Last post: <strong>{days_ago}</strong> {"days ago" if isinstance(days_ago, int) else ""}
-                </div>
-            </div>
-            <div style="width: 12px; height: 12px; background: {status_color}; border-radius: 50%;
-                        box-shadow: 0 0 10px {status_color};"></div>
-        </div>
-        <div style="color: {COLORS['text_muted']}; font-size: 0.85rem; margin-top: 10px;">
-            {"Great job staying active!" if status == "good" else "Consider posting soon!" if status == "warning" else "Time to post!"}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_REMINDER_CARD_TMPL.format_map({
+        'platform': 'Reddit',
+        'days_ago': days_ago if days_ago is not None else "Never",
+        'suffix': "days ago" if days_ago is not None else "",
+        'status_color': _STATUS_COLORS[status],
+        'message': _STATUS_MESSAGES[status],
+    }), unsafe_allow_html=True)
 
 # ===== Footer =====
 st.markdown("<br><br>", unsafe_allow_html=True)
@@ -5,9 +5,42 @@ Create trade alerts, educational content, and track record updates for X.
 
 import streamlit as st
 from datetime import datetime
+import heapq
+import html
 import json
 import os
 import sys
+from string import Template
+
+# orjson parses/serializes several times faster than stdlib json; fall
+# back to stdlib if it isn't installed.
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(data):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str)
+
+    def _json_dumps_line(data):
+        return orjson.dumps(data, default=str)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(data):
+        return json.dumps(data, indent=2, default=str).encode('utf-8')
+
+    def _json_dumps_line(data):
+        return json.dumps(data, default=str).encode('utf-8')
+
+# ijson lets us stream posts.json and filter during the parse instead
+# of materializing every post; optional, like orjson above.
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,32 +55,137 @@ except:
 
 sidebar_branding()
 
+# st.fragment (Streamlit >= 1.37) scopes reruns triggered inside the
+# decorated section to that section instead of re-running the whole
+# script; no-op on older versions.
+try:
+    _fragment = st.fragment
+except AttributeError:
+    def _fragment(func):
+        return func
+
 # ===== Constants =====
 TWITTER_CHAR_LIMIT = 280
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
 POSTS_FILE = os.path.join(DATA_DIR, 'posts.json')
+POSTS_JSONL = os.path.join(DATA_DIR, 'posts.jsonl')
+STATS_FILE = os.path.join(DATA_DIR, 'stats.json')
 
 # ===== Helper Functions =====
+def _mtime(path):
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+@st.cache_resource(show_spinner=False)
+def _load_posts_cached(json_mtime, jsonl_mtime):
+    """Read the legacy posts.json array plus the append-only posts.jsonl
+    log. Cached on both mtimes so reruns skip the disk reads and parses
+    unless a file changed.
+
+    cache_resource (not cache_data) so the list isn't re-hashed and
+    re-pickled on every access; callers must treat it as read-only."""
+    posts = []
+    if json_mtime is not None:
+        with open(POSTS_FILE, 'rb') as f:
+            posts = _json_loads(f.read())
+    if jsonl_mtime is not None:
+        with open(POSTS_JSONL, 'rb') as f:
+            posts.extend(_json_loads(line) for line in f if line.strip())
+    return posts
+
 def load_posts():
-    if os.path.exists(POSTS_FILE):
-        with open(POSTS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return []
+    """Posts list mirrored into session_state, so a save made during the
+    session appends in memory instead of forcing a re-read of the files
+    the session already has parsed."""
+    mtimes = (_mtime(POSTS_FILE), _mtime(POSTS_JSONL))
+    if st.session_state.get('posts_cache_key') != mtimes:
+        st.session_state['posts_cache'] = list(_load_posts_cached(*mtimes))
+        st.session_state['posts_cache_key'] = mtimes
+    return st.session_state['posts_cache']
+
+def stream_recent_twitter(n=10):
+    """Return the n most recent twitter posts. With ijson, posts are
+    filtered while the file is parsed so memory stays proportional to n;
+    without it, fall back to the cached full load."""
+    if ijson is None:
+        twitter_posts = [p for p in load_posts() if p.get('platform') == 'twitter']
+        return heapq.nlargest(n, twitter_posts,
+                              key=lambda x: x.get('date', x.get('created_at', '')))
+
+    def candidates():
+        if os.path.exists(POSTS_FILE):
+            with open(POSTS_FILE, 'rb') as f:
+                yield from ijson.items(f, 'item')
+        if os.path.exists(POSTS_JSONL):
+            with open(POSTS_JSONL, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        yield _json_loads(line)
+
+    heap = []
+    for i, p in enumerate(candidates()):
+        if p.get('platform') != 'twitter':
+            continue
+        entry = (p.get('date', p.get('created_at', '')), i, p)
+        if len(heap) < n:
+            heapq.heappush(heap, entry)
+        else:
+            heapq.heappushpop(heap, entry)
+    return [e[2] for e in sorted(heap, reverse=True)]
+
+def _update_stats(post_data):
+    """Incrementally maintain the stats.json sidecar (total posts and
+    last post date per platform) so the dashboard can show its metrics
+    without scanning the whole history. Seeded from the full history the
+    first time, then O(1) per save. Written atomically via os.replace."""
+    if os.path.exists(STATS_FILE):
+        with open(STATS_FILE, 'rb') as f:
+            stats = _json_loads(f.read())
+        stats['total_posts'] = stats.get('total_posts', 0) + 1
+        by_platform = stats.setdefault('last_date_by_platform', {})
+        platform = post_data.get('platform', 'unknown')
+        date_str = post_data.get('date', '')
+        if date_str >= by_platform.get(platform, ''):
+            by_platform[platform] = date_str
+    else:
+        posts = load_posts()
+        by_platform = {}
+        for p in posts:
+            platform = p.get('platform', 'unknown')
+            date_str = p.get('date', '')
+            if date_str >= by_platform.get(platform, ''):
+                by_platform[platform] = date_str
+        stats = {'total_posts': len(posts), 'last_date_by_platform': by_platform}
+    tmp = STATS_FILE + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_json_dumps(stats))
+    os.replace(tmp, STATS_FILE)
 
 def save_post(post_data):
-    posts = load_posts()
-    posts.append(post_data)
+    # O(1) append to the JSONL log instead of read-modify-rewriting the
+    # whole history; posts.json stays untouched as the legacy archive.
     os.makedirs(DATA_DIR, exist_ok=True)
-    with open(POSTS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(posts, f, indent=2, default=str)
+    with open(POSTS_JSONL, 'ab') as f:
+        f.write(_json_dumps_line(post_data))
+        f.write(b'\n')
+    _load_posts_cached.clear()
+    # Keep the session mirror current so the next rerun skips the re-read
+    if 'posts_cache' in st.session_state:
+        st.session_state['posts_cache'].append(post_data)
+        st.session_state['posts_cache_key'] = (_mtime(POSTS_FILE), _mtime(POSTS_JSONL))
+    _update_stats(post_data)
 
 # ===== Post Templates =====
-TEMPLATES = {
-    "trade_alert": {
-        "name": "Trade Alert",
-        "icon": "🎯",
-        "description": "Announce a new position or trade idea",
-        "template": """🎯 NEW POSITION: ${TICKER}
+@st.cache_resource(show_spinner=False)
+def _templates():
+    """Static template definitions, built once per process. The dict is
+    never mutated, so cache_resource shares one instance across reruns
+    without hashing or pickling it."""
+    templates = {
+        "trade_alert": {
+            "name": "Trade Alert",
+            "icon": "🎯",
+            "description": "Announce a new position or trade idea",
+            "template": """🎯 NEW POSITION: ${TICKER}
 
 ${THESIS_BRIEF}
 
@@ -59,13 +197,13 @@ ${THESIS_BRIEF}
 ⚠️ This is my trade, not advice. Do your own DD.
 
 #biotech #options #${TICKER}""",
-        "fields": ["TICKER", "THESIS_BRIEF", "STRIKE", "EXPIRY", "CATALYST"]
-    },
-    "track_record": {
-        "name": "Track Record Update",
-        "icon": "📈",
-        "description": "Share a win or loss transparently",
-        "template": """${RESULT_EMOJI} TRADE CLOSED: ${TICKER}
+            "fields": ["TICKER", "THESIS_BRIEF", "STRIKE", "EXPIRY", "CATALYST"]
+        },
+        "track_record": {
+            "name": "Track Record Update",
+            "icon": "📈",
+            "description": "Share a win or loss transparently",
+            "template": """${RESULT_EMOJI} TRADE CLOSED: ${TICKER}
 
 ${RESULT_TYPE}: ${RETURN_PCT}%
 
@@ -77,13 +215,13 @@ ${LESSON_LEARNED}
 Full transparency - every trade, win or lose.
 
 #biotech #options #trackrecord""",
-        "fields": ["TICKER", "RESULT_TYPE", "RETURN_PCT", "ENTRY_PRICE", "EXIT_PRICE", "LESSON_LEARNED"]
-    },
-    "educational": {
-        "name": "Educational",
-        "icon": "📚",
-        "description": "Share methodology or insights",
-        "template": """💡 ${TOPIC}
+            "fields": ["TICKER", "RESULT_TYPE", "RETURN_PCT", "ENTRY_PRICE", "EXIT_PRICE", "LESSON_LEARNED"]
+        },
+        "educational": {
+            "name": "Educational",
+            "icon": "📚",
+            "description": "Share methodology or insights",
+            "template": """💡 ${TOPIC}
 
 ${MAIN_POINT}
 
@@ -92,13 +230,13 @@ Key takeaway: ${TAKEAWAY}
 This is what separates systematic trading from gambling.
 
 #biotech #trading #education""",
-        "fields": ["TOPIC", "MAIN_POINT", "TAKEAWAY"]
-    },
-    "catalyst_alert": {
-        "name": "Catalyst Alert",
-        "icon": "⚡",
-        "description": "Alert about upcoming FDA event",
-        "template": """⚡ CATALYST WATCH: ${TICKER}
+            "fields": ["TOPIC", "MAIN_POINT", "TAKEAWAY"]
+        },
+        "catalyst_alert": {
+            "name": "Catalyst Alert",
+            "icon": "⚡",
+            "description": "Alert about upcoming FDA event",
+            "template": """⚡ CATALYST WATCH: ${TICKER}
 
 ${EVENT_TYPE} expected: ${EVENT_DATE}
 
@@ -109,32 +247,43 @@ What to know:
 Not trading advice - just highlighting the calendar.
 
 #biotech #FDA #catalyst""",
-        "fields": ["TICKER", "EVENT_TYPE", "EVENT_DATE", "KEY_POINT_1", "KEY_POINT_2"]
-    },
-    "thread_starter": {
-        "name": "Thread Starter",
-        "icon": "🧵",
-        "description": "Start a longer thread",
-        "template": """🧵 THREAD: ${THREAD_TITLE}
+            "fields": ["TICKER", "EVENT_TYPE", "EVENT_DATE", "KEY_POINT_1", "KEY_POINT_2"]
+        },
+        "thread_starter": {
+            "name": "Thread Starter",
+            "icon": "🧵",
+            "description": "Start a longer thread",
+            "template": """🧵 THREAD: ${THREAD_TITLE}
 
 ${HOOK}
 
 Let me break it down 👇
 
 1/""",
-        "fields": ["THREAD_TITLE", "HOOK"]
-    },
-    "custom": {
-        "name": "Custom Post",
-        "icon": "✏️",
-        "description": "Write from scratch",
-        "template": "",
-        "fields": []
+            "fields": ["THREAD_TITLE", "HOOK"]
+        },
+        "custom": {
+            "name": "Custom Post",
+            "icon": "✏️",
+            "description": "Write from scratch",
+            "template": "",
+            "fields": []
+        }
     }
-}
+    # The ${FIELD} syntax is already string.Template-compatible;
+    # precompile each one so rendering is a single-pass substitution.
+    for t in templates.values():
+        t['compiled'] = Template(t['template'])
+    return templates
+
+
+TEMPLATES = _templates()
+TEMPLATE_LABELS = {k: f"{t['icon']} {t['name']}" for k, t in TEMPLATES.items()}
 
 
 # ===== Main Content =====
+_now = datetime.now()
+
 st.title("𝕏 X Post Generator")
 
 st.markdown(f"""
@@ -146,23 +295,18 @@ st.markdown(f"""
 # ===== Template Selection =====
 section_header("Choose Template")
 
-cols = st.columns(3)
-template_keys = list(TEMPLATES.keys())
-
-for i, key in enumerate(template_keys):
-    template = TEMPLATES[key]
-    with cols[i % 3]:
-        selected = st.button(
-            f"{template['icon']} {template['name']}",
-            key=f"template_{key}",
-            use_container_width=True,
-            help=template['description']
-        )
-        if selected:
-            st.session_state['selected_template'] = key
-
-# Get selected template
-selected_template_key = st.session_state.get('selected_template', 'custom')
+# One selection widget instead of six button widgets per rerun
+if 'selected_template' not in st.session_state:
+    st.session_state['selected_template'] = 'custom'
+
+selected_template_key = st.radio(
+    "Template",
+    options=list(TEMPLATES),
+    format_func=TEMPLATE_LABELS.get,
+    horizontal=True,
+    key='selected_template',
+    label_visibility="collapsed"
+)
 selected_template = TEMPLATES[selected_template_key]
 
 st.markdown(f"""
@@ -204,15 +348,12 @@ with col1:
             else:
                 field_values[field] = st.text_input(field_label, key=f"field_{field}")
 
-        # Generate post from template
-        post_content = selected_template['template']
-        for field, value in field_values.items():
-            post_content = post_content.replace(f"${{{field}}}", value or f"[{field}]")
-
-        # Handle RESULT_EMOJI specially
+        # Generate post from template in one substitution pass
+        substitutions = {f: f"[{f}]" for f in selected_template['fields']}
+        substitutions.update({k: v for k, v in field_values.items() if v})
         if "RESULT_TYPE" in field_values:
-            emoji = "✅" if field_values["RESULT_TYPE"] == "WIN" else "❌"
-            post_content = post_content.replace("${RESULT_EMOJI}", emoji)
+            substitutions["RESULT_EMOJI"] = "✅" if field_values["RESULT_TYPE"] == "WIN" else "❌"
+        post_content = selected_template['compiled'].safe_substitute(substitutions)
 
         st.markdown("<br>", unsafe_allow_html=True)
         st.markdown("**Preview & Edit:**")
@@ -253,8 +394,8 @@ with col1:
     </div>
     """, unsafe_allow_html=True)
 
-with col2:
-    # Preview card
+@_fragment
+def _preview_card(post_content):
     st.markdown(f"""
     <div style="background: {COLORS['bg_card']}; border: 1px solid {COLORS['steel']};
                 border-radius: 12px; padding: 20px;">
@@ -276,11 +417,16 @@ with col2:
         </div>
         <div style="color: {COLORS['text_muted']}; font-size: 0.8rem; margin-top: 15px;
                     padding-top: 15px; border-top: 1px solid {COLORS['steel_dark']};">
-            {datetime.now().strftime('%I:%M %p · %b %d, %Y')}
+            {_now.strftime('%I:%M %p · %b %d, %Y')}
         </div>
     </div>
     """, unsafe_allow_html=True)
 
+
+with col2:
+    # Preview card
+    _preview_card(post_content)
+
     st.markdown("<br>", unsafe_allow_html=True)
 
     # Action buttons
@@ -296,13 +442,13 @@ with col2:
         if st.button("💾 Save Draft", use_container_width=True):
             if post_content:
                 post_data = {
-                    "id": datetime.now().strftime("%Y%m%d%H%M%S"),
+                    "id": _now.strftime("%Y%m%d%H%M%S"),
                     "platform": "twitter",
                     "title": post_content[:50],
                     "content": post_content,
                     "template": selected_template_key,
                     "status": "draft",
-                    "date": datetime.now().isoformat()
+                    "date": _now.isoformat()
                 }
                 save_post(post_data)
                 st.success("Draft saved!")
@@ -314,13 +460,13 @@ with col2:
     if st.button("✅ Mark as Posted", use_container_width=True, type="primary"):
         if post_content:
             post_data = {
-                "id": datetime.now().strftime("%Y%m%d%H%M%S"),
+                "id": _now.strftime("%Y%m%d%H%M%S"),
                 "platform": "twitter",
                 "title": post_content[:50],
                 "content": post_content,
                 "template": selected_template_key,
                 "status": "posted",
-                "date": datetime.now().isoformat()
+                "date": _now.isoformat()
             }
             save_post(post_data)
             st.success("Marked as posted! Great job staying consistent.")
@@ -360,43 +506,55 @@ with st.expander("📝 X Best Practices"):
 st.markdown("<br>", unsafe_allow_html=True)
 section_header("Recent X Posts - Click to Copy")
 
-posts = load_posts()
-twitter_posts = [p for p in posts if p.get('platform') == 'twitter']
-# Support both 'date' and 'created_at' fields
-recent_twitter = sorted(twitter_posts, key=lambda x: x.get('date', x.get('created_at', '')), reverse=True)[:10]
 
-if recent_twitter:
+@_fragment
+def _recent_posts_section():
+    # Supports both 'date' and 'created_at' fields
+    recent_twitter = stream_recent_twitter(10)
+
+    if not recent_twitter:
+        st.info("No X posts yet. Create your first one above!")
+        return
+
+    # These are display-only copy boxes, so render plain readonly
+    # textareas inside <details> in one batched st.markdown call instead
+    # of a stateful Streamlit widget per post (and per thread part).
+    textarea_style = (
+        f"width: 100%; background: {COLORS['bg_card']}; color: {COLORS['text_primary']}; "
+        f"border: 1px solid {COLORS['steel']}; border-radius: 8px; padding: 10px;"
+    )
+    cards = []
     for post in recent_twitter:
         status = post.get('status', 'draft')
         status_emoji = "✅" if status == 'posted' else "📝"
         post_date = post.get('date', post.get('created_at', ''))[:10]
-        title = post.get('title', 'Untitled')
+        title = html.escape(post.get('title', 'Untitled'))
         full_content = post.get('content', '')
         char_count = len(full_content)
 
-        with st.expander(f"{status_emoji} {title} ({char_count} chars)"):
-            st.markdown("**Select all the text below and copy it (Ctrl+A, Ctrl+C):**")
-            st.text_area(
-                "Post content",
-                value=full_content,
-                height=200,
-                key=f"content_{post.get('id')}",
-                label_visibility="collapsed"
-            )
-            st.caption(f"Created: {post_date} | Status: {status.upper()} | {char_count}/280 characters")
-
-            # Show thread parts if they exist
-            if post.get('thread_parts'):
-                st.markdown("---")
-                st.markdown("**Thread parts (post these as replies):**")
-                for i, part in enumerate(post.get('thread_parts', []), 1):
-                    st.text_area(
-                        f"Part {i}",
-                        value=part,
-                        height=100,
-                        key=f"thread_{post.get('id')}_{i}",
-                        label_visibility="collapsed"
-                    )
-                    st.caption(f"Part {i}: {len(part)}/280 characters")
-else:
-    st.info("No X posts yet. Create your first one above!")
+        inner = [
+            '<p style="margin: 10px 0 5px 0;"><strong>Select all the text below '
+            'and copy it (Ctrl+A, Ctrl+C):</strong></p>'
+            f'<textarea readonly rows="8" style="{textarea_style}">{html.escape(full_content)}</textarea>'
+            f'<div class="char-count">Created: {post_date} | Status: {status.upper()} '
+            f'| {char_count}/280 characters</div>'
+        ]
+        if post.get('thread_parts'):
+            inner.append('<hr><p style="margin: 10px 0 5px 0;"><strong>Thread parts '
+                         '(post these as replies):</strong></p>')
+            for i, part in enumerate(post.get('thread_parts', []), 1):
+                inner.append(
+                    f'<textarea readonly rows="4" style="{textarea_style}">{html.escape(part)}</textarea>'
+                    f'<div class="char-count">Part {i}: {len(part)}/280 characters</div>'
+                )
+
+        cards.append(
+            f'<details style="margin-bottom: 10px;">'
+            f'<summary style="cursor: pointer;">{status_emoji} {title} ({char_count} chars)</summary>'
+            f'{"".join(inner)}</details>'
+        )
+
+    st.markdown("".join(cards), unsafe_allow_html=True)
+
+
+_recent_posts_section()
@@ -5,12 +5,40 @@ Create longer-form thesis posts for r/options, r/wallstreetbets, r/biotechplays,
 
 import streamlit as st
 from datetime import datetime
+import heapq
 import json
 import os
+import re
 import sys
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# orjson parses/serializes several times faster than stdlib json; fall
+# back to stdlib if it isn't installed.
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(data):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str)
+
+    def _json_dumps_line(data):
+        return orjson.dumps(data, default=str)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(data):
+        return json.dumps(data, indent=2, default=str).encode('utf-8')
+
+    def _json_dumps_line(data):
+        return json.dumps(data, default=str).encode('utf-8')
+
+# Add parent directory to path for imports (skip if already present so
+# reruns don't grow sys.path and slow every later import lookup)
+_PARENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PARENT_DIR not in sys.path:
+    sys.path.insert(0, _PARENT_DIR)
 
 from theme import sidebar_branding, section_header, COLORS
 
@@ -22,59 +50,194 @@ except:
 
 sidebar_branding()
 
+# st.fragment (Streamlit >= 1.37) scopes reruns triggered inside the
+# decorated section to that section instead of re-running the whole
+# script; no-op on older versions.
+try:
+    _fragment = st.fragment
+except AttributeError:
+    def _fragment(func):
+        return func
+
 # ===== Constants =====
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
 POSTS_FILE = os.path.join(DATA_DIR, 'posts.json')
+POSTS_JSONL = os.path.join(DATA_DIR, 'posts.jsonl')
+STATS_FILE = os.path.join(DATA_DIR, 'stats.json')
 
 # Subreddit options
-SUBREDDITS = {
-    "r/options": {
-        "name": "r/options",
-        "description": "Options trading strategies and education",
-        "rules": "Educational focus, no pump-and-dump, include position details",
-        "best_for": "Strategy posts, educational content"
-    },
-    "r/biotechplays": {
-        "name": "r/biotechplays",
-        "description": "Biotech-focused trading discussion",
-        "rules": "Include DD, catalyst dates, be transparent about positions",
-        "best_for": "Biotech thesis, catalyst plays"
-    },
-    "r/wallstreetbets": {
-        "name": "r/wallstreetbets",
-        "description": "High-risk trading, memes, YOLO plays",
-        "rules": "Min position size requirements, entertaining format",
-        "best_for": "Big wins/losses, bold plays"
-    },
-    "r/stocks": {
-        "name": "r/stocks",
-        "description": "General stock discussion",
-        "rules": "Substantive content, no low-effort posts",
-        "best_for": "Company analysis, sector discussion"
+@st.cache_resource(show_spinner=False)
+def subreddits_factory():
+    """Static subreddit metadata, built once per process and shared
+    across sessions without per-access copies."""
+    return {
+        "r/options": {
+            "name": "r/options",
+            "description": "Options trading strategies and education",
+            "rules": "Educational focus, no pump-and-dump, include position details",
+            "best_for": "Strategy posts, educational content"
+        },
+        "r/biotechplays": {
+            "name": "r/biotechplays",
+            "description": "Biotech-focused trading discussion",
+            "rules": "Include DD, catalyst dates, be transparent about positions",
+            "best_for": "Biotech thesis, catalyst plays"
+        },
+        "r/wallstreetbets": {
+            "name": "r/wallstreetbets",
+            "description": "High-risk trading, memes, YOLO plays",
+            "rules": "Min position size requirements, entertaining format",
+            "best_for": "Big wins/losses, bold plays"
+        },
+        "r/stocks": {
+            "name": "r/stocks",
+            "description": "General stock discussion",
+            "rules": "Substantive content, no low-effort posts",
+            "best_for": "Company analysis, sector discussion"
+        }
     }
-}
+
+
+SUBREDDITS = subreddits_factory()
+
+# Matches the {FIELD} placeholders used by the templates below
+_FIELD_RE = re.compile(r"\{([A-Z0-9_]+)\}")
+
+# Word counting without materializing a token list per rerun
+_WORD_RE = re.compile(r"\S+")
+
+# Field-type sets for the compose loop: O(1) membership instead of
+# rebuilding a list literal per field per rerun. Members are interned so
+# lookups against interned field names short-circuit on identity.
+_TEXTAREA_FIELDS = frozenset(map(sys.intern, (
+    "TLDR", "SUMMARY", "INTRO", "CONCLUSION", "BULL_CASE", "BEAR_CASE",
+    "MAIN_CONTENT", "CATALYST_DETAILS", "WHAT_HAPPENED", "LESSONS",
+    "TAKEAWAYS", "EXAMPLE", "MY_POSITION",
+)))
+_AUTO_SET_FIELDS = frozenset(map(sys.intern, ("RESULT_EMOJI", "RESULT_WORD")))
 
 # ===== Helper Functions =====
+def _mtime(path):
+    # Single stat; the exists-then-getmtime form costs two
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+@st.cache_data(show_spinner=False)
+def _load_posts_cached(json_mtime, jsonl_mtime):
+    """Read the legacy posts.json array plus the append-only posts.jsonl
+    log (shared with the X generator). Cached on both mtimes so reruns
+    skip the disk reads and parses unless a file changed."""
+    posts = []
+    if json_mtime is not None:
+        with open(POSTS_FILE, 'rb') as f:
+            posts = _json_loads(f.read())
+    if jsonl_mtime is not None:
+        with open(POSTS_JSONL, 'rb') as f:
+            posts.extend(_json_loads(line) for line in f if line.strip())
+    return posts
+
 def load_posts():
-    if os.path.exists(POSTS_FILE):
-        with open(POSTS_FILE, 'r') as f:
-            return json.load(f)
-    return []
+    return _load_posts_cached(_mtime(POSTS_FILE), _mtime(POSTS_JSONL))
+
+def tail_recent_reddit(n=5):
+    """Return the n most recent reddit posts. The JSONL log appends in
+    chronological order, so reading its last ~64KB and walking the lines
+    newest-first usually answers without touching the full history; if
+    the tail doesn't yield enough, fall back to the merged load."""
+    try:
+        with open(POSTS_JSONL, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            f.seek(max(0, size - 65536))
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        lines = None
+    if lines is not None:
+        if size > 65536 and lines:
+            lines = lines[1:]  # drop the possibly-partial first line
+        out = []
+        for line in reversed(lines):
+            if not line.strip():
+                continue
+            p = _json_loads(line)
+            if p.get('platform') == 'reddit':
+                out.append(p)
+                if len(out) == n:
+                    return out
+    # Log tail didn't have enough; scan the merged history instead
+    reddit_posts = [p for p in load_posts() if p.get('platform') == 'reddit']
+    return heapq.nlargest(n, reddit_posts, key=lambda x: x.get('date', ''))
+
+def _update_stats(new_posts):
+    """Keep the stats.json sidecar (total posts, last post date per
+    platform) current so the dashboard metrics stay O(1); same scheme as
+    the X generator. Takes the whole flushed batch: when the sidecar is
+    missing it seeds from the full history, which already includes every
+    record just written, so per-record increments on top of the seed
+    would double-count. Written atomically via os.replace."""
+    try:
+        with open(STATS_FILE, 'rb') as f:
+            stats = _json_loads(f.read())
+    except FileNotFoundError:
+        stats = None
+    if stats is not None:
+        stats['total_posts'] = stats.get('total_posts', 0) + len(new_posts)
+        by_platform = stats.setdefault('last_date_by_platform', {})
+        for post_data in new_posts:
+            platform = post_data.get('platform', 'unknown')
+            date_str = post_data.get('date', '')
+            if date_str >= by_platform.get(platform, ''):
+                by_platform[platform] = date_str
+    else:
+        posts = load_posts()
+        by_platform = {}
+        for p in posts:
+            platform = p.get('platform', 'unknown')
+            date_str = p.get('date', '')
+            if date_str >= by_platform.get(platform, ''):
+                by_platform[platform] = date_str
+        stats = {'total_posts': len(posts), 'last_date_by_platform': by_platform}
+    tmp = STATS_FILE + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_json_dumps(stats))
+    os.replace(tmp, STATS_FILE)
+
+def _flush_pending():
+    """Write all queued posts with one file open, then invalidate the
+    cache and bump the stats sidecar once for the whole batch."""
+    pending = st.session_state.get('_pending_posts', [])
+    if not pending:
+        return
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with open(POSTS_JSONL, 'ab') as f:
+        # One write call per record so an appended line can't be torn
+        f.write(b''.join(_json_dumps_line(p) + b'\n' for p in pending))
+    _load_posts_cached.clear()
+    _update_stats(pending)
+    st.session_state['_pending_posts'] = []
 
 def save_post(post_data):
-    posts = load_posts()
-    posts.append(post_data)
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(POSTS_FILE, 'w') as f:
-        json.dump(posts, f, indent=2, default=str)
+    # Flush on every save: a JSONL append is O(1) regardless of history
+    # size, and a record left queued in session state would be invisible
+    # to load_posts and lost if the session ended before a later flush.
+    # The queue still batches anything left over from a previous run
+    # into the same single write.
+    st.session_state.setdefault('_pending_posts', []).append(post_data)
+    _flush_pending()
 
 # ===== Post Templates =====
-TEMPLATES = {
-    "dd_thesis": {
-        "name": "DD / Thesis Post",
-        "icon": "🔬",
-        "description": "In-depth analysis of a biotech opportunity",
-        "template": """# {TICKER}: {TITLE}
+@st.cache_resource(show_spinner=False)
+def templates_factory():
+    """Static template definitions, built once per process and shared
+    across sessions without per-access copies. Field names are interned
+    so the compose loop's dict and set lookups compare by identity."""
+    templates = {
+        "dd_thesis": {
+            "name": "DD / Thesis Post",
+            "icon": "🔬",
+            "description": "In-depth analysis of a biotech opportunity",
+            "template": """# {TICKER}: {TITLE}
 
 ## TL;DR
 {TLDR}
@@ -120,15 +283,15 @@ TEMPLATES = {
 
 *Disclaimer: This is not financial advice. I am sharing my research and current positions for educational purposes. Do your own due diligence.*
 """,
-        "fields": ["TICKER", "TITLE", "TLDR", "COMPANY_NAME", "MARKET_CAP", "CURRENT_PRICE",
-                   "CATALYST_TYPE", "CATALYST_DATE", "CATALYST_DETAILS", "POSITION_DETAILS",
-                   "RISK_REWARD", "BULL_CASE", "BEAR_CASE", "MY_POSITION"]
-    },
-    "trade_recap": {
-        "name": "Trade Recap",
-        "icon": "📊",
-        "description": "Share results of a closed trade",
-        "template": """# {RESULT_EMOJI} {TICKER} Trade Recap: {RETURN_PCT}% {RESULT_TYPE}
+            "fields": ["TICKER", "TITLE", "TLDR", "COMPANY_NAME", "MARKET_CAP", "CURRENT_PRICE",
+                       "CATALYST_TYPE", "CATALYST_DATE", "CATALYST_DETAILS", "POSITION_DETAILS",
+                       "RISK_REWARD", "BULL_CASE", "BEAR_CASE", "MY_POSITION"]
+        },
+        "trade_recap": {
+            "name": "Trade Recap",
+            "icon": "📊",
+            "description": "Share results of a closed trade",
+            "template": """# {RESULT_EMOJI} {TICKER} Trade Recap: {RETURN_PCT}% {RESULT_TYPE}
 
 ## Summary
 {SUMMARY}
@@ -168,14 +331,14 @@ Full transparency - I post wins AND losses.
 
 *Not financial advice. Past performance doesn't guarantee future results.*
 """,
-        "fields": ["TICKER", "RESULT_TYPE", "RETURN_PCT", "SUMMARY", "ENTRY_DETAILS",
-                   "EXIT_DETAILS", "WHAT_HAPPENED", "LESSONS", "YTD_RECORD"]
-    },
-    "educational": {
-        "name": "Educational Post",
-        "icon": "📚",
-        "description": "Teach a concept or methodology",
-        "template": """# {TITLE}
+            "fields": ["TICKER", "RESULT_TYPE", "RETURN_PCT", "SUMMARY", "ENTRY_DETAILS",
+                       "EXIT_DETAILS", "WHAT_HAPPENED", "LESSONS", "YTD_RECORD"]
+        },
+        "educational": {
+            "name": "Educational Post",
+            "icon": "📚",
+            "description": "Teach a concept or methodology",
+            "template": """# {TITLE}
 
 ## Introduction
 
@@ -209,13 +372,13 @@ Full transparency - I post wins AND losses.
 
 *Questions? Drop them in the comments. Happy to discuss.*
 """,
-        "fields": ["TITLE", "INTRO", "MAIN_CONTENT", "EXAMPLE", "TAKEAWAYS", "CONCLUSION"]
-    },
-    "catalyst_watch": {
-        "name": "Catalyst Watch",
-        "icon": "📅",
-        "description": "Alert about upcoming FDA catalysts",
-        "template": """# Biotech Catalyst Watch: {DATE_RANGE}
+            "fields": ["TITLE", "INTRO", "MAIN_CONTENT", "EXAMPLE", "TAKEAWAYS", "CONCLUSION"]
+        },
+        "catalyst_watch": {
+            "name": "Catalyst Watch",
+            "icon": "📅",
+            "description": "Alert about upcoming FDA catalysts",
+            "template": """# Biotech Catalyst Watch: {DATE_RANGE}
 
 Here are some notable FDA catalysts coming up:
 
@@ -244,78 +407,138 @@ Here are some notable FDA catalysts coming up:
 
 *These are just calendar events I'm watching. Not recommendations. Always do your own DD.*
 """,
-        "fields": ["DATE_RANGE", "TICKER_1", "EVENT_1", "DATE_1", "NOTES_1",
-                   "TICKER_2", "EVENT_2", "DATE_2", "NOTES_2",
-                   "TICKER_3", "EVENT_3", "DATE_3", "NOTES_3"]
-    },
-    "custom": {
-        "name": "Custom Post",
-        "icon": "✏️",
-        "description": "Write from scratch",
-        "template": "",
-        "fields": []
+            "fields": ["DATE_RANGE", "TICKER_1", "EVENT_1", "DATE_1", "NOTES_1",
+                       "TICKER_2", "EVENT_2", "DATE_2", "NOTES_2",
+                       "TICKER_3", "EVENT_3", "DATE_3", "NOTES_3"]
+        },
+        "custom": {
+            "name": "Custom Post",
+            "icon": "✏️",
+            "description": "Write from scratch",
+            "template": "",
+            "fields": []
+        }
     }
-}
+    for t in templates.values():
+        t['fields'] = [sys.intern(f) for f in t['fields']]
+    return templates
 
 
-# ===== Main Content =====
-st.title("📝 Reddit Post Generator")
+TEMPLATES = templates_factory()
 
-st.markdown(f"""
+
+# ===== Precompiled HTML =====
+# Static wrappers interpolated once at import with the theme colors
+# baked in; per-rerun values go through str.format on the constant.
+_INTRO_HTML = f"""
 <p style="color: {COLORS['text_secondary']}; margin-bottom: 30px;">
     Create longer-form content for Reddit's trading communities.
 </p>
-""", unsafe_allow_html=True)
+"""
 
-# ===== Subreddit Selection =====
-section_header("Target Subreddit")
+_SELECTED_TEMPLATE_HTML = f"""
+<div style="color: {COLORS['text_muted']}; margin: 15px 0 30px 0;">
+    Selected: <span style="color: {COLORS['gold']};">{{icon}} {{name}}</span>
+    - {{description}}
+</div>
+"""
+
+_WORD_COUNT_HTML = f"""
+<div style="color: {COLORS['text_muted']}; font-size: 0.9rem; margin-top: 10px;">
+    Word count: {{word_count}} | Estimated read time: {{read_time}} min
+</div>
+"""
 
-selected_sub = st.selectbox(
-    "Choose subreddit",
-    options=list(SUBREDDITS.keys()),
-    format_func=lambda x: f"{x} - {SUBREDDITS[x]['description']}"
-)
 
-sub_info = SUBREDDITS[selected_sub]
-st.markdown(f"""
+# ===== Cached HTML Builders =====
+@st.cache_data(show_spinner=False)
+def _sub_guidelines_html(sub_key):
+    """Guidelines banner HTML, rebuilt only when the subreddit changes."""
+    info = SUBREDDITS[sub_key]
+    return f"""
 <div style="background: {COLORS['mahogany_dark']}; padding: 15px 20px; border-radius: 8px;
             margin: 10px 0 30px 0; border-left: 3px solid {COLORS['gold']};">
     <div style="color: {COLORS['gold']}; font-weight: 600; margin-bottom: 5px;">
-        {sub_info['name']} Guidelines
+        {info['name']} Guidelines
     </div>
     <div style="color: {COLORS['text_secondary']}; font-size: 0.9rem;">
-        <strong>Rules:</strong> {sub_info['rules']}<br>
-        <strong>Best for:</strong> {sub_info['best_for']}
+        <strong>Rules:</strong> {info['rules']}<br>
+        <strong>Best for:</strong> {info['best_for']}
+    </div>
+</div>
+"""
+
+
+@st.cache_data(show_spinner=False)
+def _recent_post_card_html(subreddit, title, date_str, status):
+    """Recent-post card HTML, re-interpolated only for unseen posts."""
+    status_color = COLORS['positive'] if status == 'posted' else COLORS['warning']
+    return f"""
+<div style="background: {COLORS['bg_card']}; border: 1px solid {COLORS['steel']};
+            border-radius: 8px; padding: 15px; margin-bottom: 10px;">
+    <div style="display: flex; justify-content: space-between; align-items: start;">
+        <div style="flex: 1;">
+            <div style="color: {COLORS['gold']}; font-size: 0.8rem; margin-bottom: 5px;">
+                {subreddit}
+            </div>
+            <div style="color: {COLORS['text_primary']}; font-weight: 600; margin-bottom: 5px;">
+                {title}...
+            </div>
+            <div style="color: {COLORS['text_muted']}; font-size: 0.8rem;">
+                {date_str}
+            </div>
+        </div>
+        <span style="background: {status_color}20; color: {status_color};
+                    padding: 3px 10px; border-radius: 12px; font-size: 0.75rem;
+                    text-transform: uppercase; margin-left: 15px;">
+            {status}
+        </span>
     </div>
 </div>
-""", unsafe_allow_html=True)
+"""
+
+
+# ===== Main Content =====
+_now = datetime.now()
+
+st.title("📝 Reddit Post Generator")
+
+st.markdown(_INTRO_HTML, unsafe_allow_html=True)
+
+# ===== Subreddit Selection =====
+section_header("Target Subreddit")
+
+selected_sub = st.selectbox(
+    "Choose subreddit",
+    options=list(SUBREDDITS.keys()),
+    format_func=lambda x: f"{x} - {SUBREDDITS[x]['description']}"
+)
+
+st.markdown(_sub_guidelines_html(selected_sub), unsafe_allow_html=True)
 
 # ===== Template Selection =====
 section_header("Choose Template")
 
-cols = st.columns(5)
-template_keys = list(TEMPLATES.keys())
-
-for i, key in enumerate(template_keys):
-    template = TEMPLATES[key]
-    with cols[i % 5]:
-        if st.button(
-            f"{template['icon']}\n{template['name']}",
-            key=f"template_{key}",
-            use_container_width=True
-        ):
-            st.session_state['reddit_template'] = key
-
-# Get selected template
-selected_template_key = st.session_state.get('reddit_template', 'custom')
+# One radio widget instead of five buttons: selection lives natively in
+# session_state and a pick reruns one widget's worth of state, not five
+if 'reddit_template' not in st.session_state:
+    st.session_state['reddit_template'] = 'custom'
+
+selected_template_key = st.radio(
+    "Template",
+    options=list(TEMPLATES.keys()),
+    format_func=lambda k: f"{TEMPLATES[k]['icon']} {TEMPLATES[k]['name']}",
+    horizontal=True,
+    key='reddit_template',
+    label_visibility="collapsed"
+)
 selected_template = TEMPLATES[selected_template_key]
 
-st.markdown(f"""
-<div style="color: {COLORS['text_muted']}; margin: 15px 0 30px 0;">
-    Selected: <span style="color: {COLORS['gold']};">{selected_template['icon']} {selected_template['name']}</span>
-    - {selected_template['description']}
-</div>
-""", unsafe_allow_html=True)
+st.markdown(_SELECTED_TEMPLATE_HTML.format(
+    icon=selected_template['icon'],
+    name=selected_template['name'],
+    description=selected_template['description'],
+), unsafe_allow_html=True)
 
 # ===== Post Editor =====
 section_header("Compose Post")
@@ -338,40 +561,46 @@ if selected_template['fields']:
 
         with col:
             # Determine input type based on field name
-            if field in ["TLDR", "SUMMARY", "INTRO", "CONCLUSION", "BULL_CASE", "BEAR_CASE",
-                        "MAIN_CONTENT", "CATALYST_DETAILS", "WHAT_HAPPENED", "LESSONS",
-                        "TAKEAWAYS", "EXAMPLE", "MY_POSITION"]:
+            if field in _TEXTAREA_FIELDS:
                 field_values[field] = st.text_area(field_label, key=f"reddit_field_{field}", height=120)
             elif field == "RESULT_TYPE":
                 field_values[field] = st.selectbox(field_label, ["WIN", "LOSS"], key=f"reddit_field_{field}")
-            elif field == "RESULT_EMOJI":
-                # Auto-set
-                pass
-            elif field == "RESULT_WORD":
-                # Auto-set
+            elif field in _AUTO_SET_FIELDS:
                 pass
             else:
                 field_values[field] = st.text_input(field_label, key=f"reddit_field_{field}")
 
-    # Generate post content
-    post_content = selected_template['template']
-    for field, value in field_values.items():
-        post_content = post_content.replace("{" + field + "}", value or f"[{field}]")
-
-    # Handle auto-set fields
+    # Generate post content in a single pass over the template,
+    # auto-set fields included, instead of one str.replace per field
+    mapping = {k: v for k, v in field_values.items() if v}
     if "RESULT_TYPE" in field_values:
         result_type = field_values["RESULT_TYPE"]
-        post_content = post_content.replace("{RESULT_EMOJI}", "✅" if result_type == "WIN" else "❌")
-        post_content = post_content.replace("{RESULT_WORD}", "Right" if result_type == "WIN" else "Wrong")
-
-    st.markdown("<br>**Preview & Edit:**", unsafe_allow_html=True)
-    post_content = st.text_area(
-        "Post Content",
-        value=post_content,
-        height=400,
-        key="reddit_post_content",
-        label_visibility="collapsed"
-    )
+        mapping["RESULT_EMOJI"] = "✅" if result_type == "WIN" else "❌"
+        mapping["RESULT_WORD"] = "Right" if result_type == "WIN" else "Wrong"
+
+    # Only re-render when the template or field values actually changed,
+    # not on reruns triggered by other widgets (e.g. preview edits)
+    fingerprint = (selected_template_key, tuple(sorted(mapping.items())))
+    if st.session_state.get('_reddit_render_fp') != fingerprint:
+        st.session_state['_reddit_rendered'] = _FIELD_RE.sub(
+            lambda m: mapping.get(m.group(1), f"[{m.group(1)}]"),
+            selected_template['template']
+        )
+        st.session_state['_reddit_render_fp'] = fingerprint
+    post_content = st.session_state['_reddit_rendered']
+
+    # Only mount the big editor on request: while it's unmounted, each
+    # keystroke in a field input ships just that field over the
+    # websocket instead of the whole composed post.
+    st.markdown("<br>", unsafe_allow_html=True)
+    if st.checkbox("✏️ Preview & edit the composed post", key="reddit_edit_preview"):
+        post_content = st.text_area(
+            "Post Content",
+            value=post_content,
+            height=400,
+            key="reddit_post_content",
+            label_visibility="collapsed"
+        )
 else:
     post_content = st.text_area(
         "Post Content",
@@ -381,14 +610,28 @@ else:
     )
 
 # Word count
-word_count = len(post_content.split()) if post_content else 0
-st.markdown(f"""
-<div style="color: {COLORS['text_muted']}; font-size: 0.9rem; margin-top: 10px;">
-    Word count: {word_count} | Estimated read time: {max(1, word_count // 200)} min
-</div>
-""", unsafe_allow_html=True)
+word_count = sum(1 for _ in _WORD_RE.finditer(post_content)) if post_content else 0
+st.markdown(_WORD_COUNT_HTML.format(
+    word_count=word_count,
+    read_time=max(1, word_count // 200),
+), unsafe_allow_html=True)
 
 # ===== Action Buttons =====
+def _make_post_data(status):
+    """Post record for save_post; id and date come from the same
+    timestamp captured at the top of the render."""
+    return {
+        "id": _now.strftime("%Y%m%d%H%M%S"),
+        "platform": "reddit",
+        "subreddit": selected_sub,
+        "title": post_title,
+        "content": post_content,
+        "template": selected_template_key,
+        "status": status,
+        "date": _now.isoformat()
+    }
+
+
 st.markdown("<br>", unsafe_allow_html=True)
 
 col1, col2, col3, col4 = st.columns(4)
@@ -404,17 +647,7 @@ with col2:
 with col3:
     if st.button("💾 Save Draft", use_container_width=True):
         if post_title and post_content:
-            post_data = {
-                "id": datetime.now().strftime("%Y%m%d%H%M%S"),
-                "platform": "reddit",
-                "subreddit": selected_sub,
-                "title": post_title,
-                "content": post_content,
-                "template": selected_template_key,
-                "status": "draft",
-                "date": datetime.now().isoformat()
-            }
-            save_post(post_data)
+            save_post(_make_post_data("draft"))
             st.success("Draft saved!")
         else:
             st.warning("Please add a title and content!")
@@ -422,17 +655,7 @@ with col3:
 with col4:
     if st.button("✅ Mark as Posted", use_container_width=True, type="primary"):
         if post_title and post_content:
-            post_data = {
-                "id": datetime.now().strftime("%Y%m%d%H%M%S"),
-                "platform": "reddit",
-                "subreddit": selected_sub,
-                "title": post_title,
-                "content": post_content,
-                "template": selected_template_key,
-                "status": "posted",
-                "date": datetime.now().isoformat()
-            }
-            save_post(post_data)
+            save_post(_make_post_data("posted"))
             st.success("Marked as posted!")
             st.balloons()
         else:
@@ -483,38 +706,28 @@ with st.expander("📝 Reddit Best Practices"):
     """)
 
 # ===== Recent Reddit Posts =====
-st.markdown("<br>", unsafe_allow_html=True)
-section_header("Recent Reddit Posts")
+@_fragment
+def _recent_panel():
+    # An expander body still runs on every rerun (it is only collapsed
+    # client-side), so the tail-read and card rendering are gated behind
+    # an opt-in checkbox instead, like the schedule page's activity log.
+    # The fragment keeps toggling it from rerunning the composer above.
+    if not st.checkbox("🕑 Show recent Reddit posts", key="show_recent_reddit"):
+        return
+
+    recent_reddit = tail_recent_reddit(5)
+
+    if recent_reddit:
+        for post in recent_reddit:
+            st.markdown(_recent_post_card_html(
+                post.get('subreddit', 'r/unknown'),
+                post.get('title', 'Untitled')[:60],
+                post.get('date', '')[:10],
+                post.get('status', 'draft'),
+            ), unsafe_allow_html=True)
+    else:
+        st.info("No Reddit posts yet. Create your first one above!")
 
-posts = load_posts()
-reddit_posts = [p for p in posts if p.get('platform') == 'reddit']
-recent_reddit = sorted(reddit_posts, key=lambda x: x.get('date', ''), reverse=True)[:5]
 
-if recent_reddit:
-    for post in recent_reddit:
-        status_color = COLORS['positive'] if post.get('status') == 'posted' else COLORS['warning']
-        st.markdown(f"""
-        <div style="background: {COLORS['bg_card']}; border: 1px solid {COLORS['steel']};
-                    border-radius: 8px; padding: 15px; margin-bottom: 10px;">
-            <div style="display: flex; justify-content: space-between; align-items: start;">
-                <div style="flex: 1;">
-                    <div style="color: {COLORS['gold']}; font-size: 0.8rem; margin-bottom: 5px;">
-                        {post.get('subreddit', 'r/unknown')}
-                    </div>
-                    <div style="color: {COLORS['text_primary']}; font-weight: 600; margin-bottom: 5px;">
-                        {post.get('title', 'Untitled')[:60]}...
-                    </div>
-                    <div style="color: {COLORS['text_muted']}; font-size: 0.8rem;">
-                        {post.get('date', '')[:10]}
-                    </div>
-                </div>
-                <span style="background: {status_color}20; color: {status_color};
-                            padding: 3px 10px; border-radius: 12px; font-size: 0.75rem;
-                            text-transform: uppercase; margin-left: 15px;">
-                    {post.get('status', 'draft')}
-                </span>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-else:
-    st.info("No Reddit posts yet. Create your first one above!")
+st.markdown("<br>", unsafe_allow_html=True)
+_recent_panel()
@@ -5,15 +5,35 @@ NOTE: Does NOT store passwords - use a password manager for that!
 """
 
 import streamlit as st
+from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 import json
 import os
 import sys
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# orjson parses/serializes several times faster than stdlib json; fall
+# back to stdlib if it isn't installed.
+try:
+    import orjson
 
-from theme import sidebar_branding, section_header, metric_card, COLORS
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(data):
+        return orjson.dumps(data, default=str)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(data):
+        return json.dumps(data, default=str).encode('utf-8')
+
+# Add parent directory to path for imports (skip if already present so
+# reruns don't grow sys.path and slow every later import lookup)
+_PARENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PARENT_DIR not in sys.path:
+    sys.path.insert(0, _PARENT_DIR)
 
 # Page config
 try:
@@ -21,11 +41,28 @@ try:
 except:
     pass
 
+# Imported after set_page_config so the first frame ships before the
+# theme module's CSS work runs
+from theme import sidebar_branding, section_header, metric_card, COLORS
+
 sidebar_branding()
 
+# st.fragment (Streamlit >= 1.37) scopes reruns triggered inside the
+# decorated section to that section instead of re-running the whole
+# script; no-op on older versions.
+try:
+    _fragment = st.fragment
+except AttributeError:
+    def _fragment(func):
+        return func
+
 # ===== Constants =====
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
 ACCOUNTS_FILE = os.path.join(DATA_DIR, 'accounts.json')
+HISTORY_FILE = os.path.join(DATA_DIR, 'follower_history.jsonl')
+
+# Ensure the data dir once at import instead of a stat per save
+os.makedirs(DATA_DIR, exist_ok=True)
 
 # Platform configurations
 PLATFORMS = {
@@ -73,19 +110,123 @@ PLATFORMS = {
     }
 }
 
+# Colors still referenced per account in the render loop, bound once so
+# each use is a global load instead of a dict subscription
+_POSITIVE = COLORS['positive']
+_TEXT_MUTED = COLORS['text_muted']
+_GOLD = COLORS['gold']
+_STEEL = COLORS['steel']
+
+# ===== Precompiled HTML =====
+# Card markup interpolated once at import with the theme colors baked
+# in; the render loop fills only the per-account values via format_map
+# instead of re-evaluating a large f-string per account per rerun.
+_PLATFORM_HEADER_TMPL = f"""
+<div style="color: {COLORS['gold']}; font-size: 1.1rem; font-weight: 600;
+            margin: 20px 0 10px 0;">
+    {{icon}} {{name}}
+</div>
+"""
+
+_ACCOUNT_CARD_TMPL = f"""
+<div style="background: {COLORS['bg_card']}; border: 1px solid {COLORS['steel']};
+            border-left: 3px solid {{border_color}};
+            border-radius: 8px; padding: 20px; margin-bottom: 10px;">
+    <div style="display: flex; justify-content: space-between; align-items: start;">
+        <div>
+            <div style="color: {COLORS['text_primary']}; font-size: 1.2rem; font-weight: 600;">
+                {{display_name}}
+            </div>
+            <div style="color: {COLORS['text_muted']}; font-size: 0.9rem;">
+                @{{username}}
+            </div>
+            <div style="color: {COLORS['gold']}; font-size: 1.1rem; margin-top: 10px;">
+                {{followers}} followers
+            </div>
+            {{notes_html}}
+        </div>
+        <div style="display: flex; flex-direction: column; align-items: flex-end; gap: 10px;">
+            <span style="background: {{status_color}}20; color: {{status_color}};
+                        padding: 3px 10px; border-radius: 12px; font-size: 0.75rem;">
+                {{status_label}}
+            </span>
+        </div>
+    </div>
+</div>
+"""
+
+_NOTES_TMPL = f'<div style="color: {COLORS["text_muted"]}; font-size: 0.85rem; margin-top: 5px;">{{notes}}</div>'
+
+_LINK_BTN_TMPL = f"""
+<a href="{{href}}" target="_blank" style="
+    display: inline-block;
+    background: {COLORS['steel_dark']};
+    border: 1px solid {COLORS['steel']};
+    color: {COLORS['text_secondary']};
+    padding: 8px 12px;
+    border-radius: 6px;
+    text-decoration: none;
+    font-size: 0.85rem;
+    text-align: center;
+    width: 100%;
+">{{label}}</a>
+"""
+
+# Login URLs never vary per account, so the full anchor is baked per
+# platform at import; the render loop just emits the stored string
+for _cfg in PLATFORMS.values():
+    _cfg['_login_html'] = _LINK_BTN_TMPL.format_map({
+        'href': _cfg['login_url'],
+        'label': '🔑 Login',
+    })
+
+
 # ===== Helper Functions =====
-def load_accounts():
-    if os.path.exists(ACCOUNTS_FILE):
-        with open(ACCOUNTS_FILE, 'r') as f:
-            return json.load(f)
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+@st.cache_data(show_spinner=False)
+def _load_accounts_cached(mtime):
+    """Parse accounts.json once per file change; the mtime key means
+    reruns hit the cache instead of re-reading and re-parsing."""
+    # Binary read with a 64KB buffer, parsed in one shot: json.load on a
+    # default text handle does many small reads plus decoding
+    if mtime is not None:
+        with open(ACCOUNTS_FILE, 'rb', buffering=65536) as f:
+            return _json_loads(f.read())
     return []
 
-def save_accounts(accounts):
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(ACCOUNTS_FILE, 'w') as f:
-        json.dump(accounts, f, indent=2, default=str)
+def load_accounts():
+    return _load_accounts_cached(_mtime(ACCOUNTS_FILE))
 
+def save_accounts(accounts):
+    # Serialize to one bytes blob and write it in a single buffered
+    # call; compact output (no indent) halves what's written and parsed.
+    # Written to a tmp file then renamed so a crash mid-write can't
+    # truncate the account list.
+    tmp = ACCOUNTS_FILE + '.tmp'
+    with open(tmp, 'wb', buffering=65536) as f:
+        f.write(_json_dumps(accounts))
+    os.replace(tmp, ACCOUNTS_FILE)
+    _load_accounts_cached.clear()
+
+def append_follower_history(entries):
+    """Append follower data points to the history log. New points go to
+    the append-only JSONL file so updates cost O(changes) instead of
+    rewriting every historical point embedded in accounts.json; history
+    already stored inside existing accounts stays where it is."""
+    if not entries:
+        return
+    with open(HISTORY_FILE, 'ab', buffering=65536) as f:
+        f.write(b''.join(_json_dumps(e) + b'\n' for e in entries))
+
+@lru_cache(maxsize=1024)
 def get_profile_url(platform_key, username):
+    # Memoized: PLATFORMS is static and the same (platform, username)
+    # pairs recur every rerun, so repeat calls are a dict hit
     platform = PLATFORMS.get(platform_key, {})
     template = platform.get('profile_url_template')
     if template and username:
@@ -94,13 +235,15 @@ def get_profile_url(platform_key, username):
 
 
 # ===== Load Data =====
-if 'accounts' not in st.session_state:
-    st.session_state.accounts = load_accounts()
-
-accounts = st.session_state.accounts
+# One canonical list: every read and mutation below goes through this
+# binding, and mutations happen in place so session_state, the render
+# loop, and the save path all see the same object
+accounts = st.session_state.setdefault('accounts', load_accounts())
 
 
 # ===== Main Content =====
+_now = datetime.now()
+
 st.title("👤 Account Tracker")
 
 st.markdown(f"""
@@ -113,161 +256,56 @@ st.markdown(f"""
 </p>
 """, unsafe_allow_html=True)
 
-# ===== Quick Stats =====
-active_accounts = [a for a in accounts if a.get('active', True)]
-total_followers = sum(a.get('followers', 0) for a in active_accounts)
-
-col1, col2, col3 = st.columns(3)
-with col1:
-    metric_card("Active Accounts", str(len(active_accounts)))
-with col2:
-    metric_card("Total Followers", f"{total_followers:,}")
-with col3:
-    metric_card("Platforms", str(len(set(a.get('platform') for a in active_accounts))))
-
-st.markdown("<br>", unsafe_allow_html=True)
-
 # ===== Add New Account =====
-section_header("Add New Account")
+def _add_account_section():
+    section_header("Add New Account")
 
-with st.expander("➕ Add Account", expanded=len(accounts) == 0):
-    col1, col2 = st.columns(2)
+    with st.expander("➕ Add Account", expanded=not accounts):
+        col1, col2 = st.columns(2)
 
-    with col1:
-        new_platform = st.selectbox(
-            "Platform",
-            options=list(PLATFORMS.keys()),
-            format_func=lambda x: f"{PLATFORMS[x]['icon']} {PLATFORMS[x]['name']}"
-        )
-        new_username = st.text_input("Username (without @)", placeholder="PowersBioStrikes")
-
-    with col2:
-        new_display_name = st.text_input("Display Name", placeholder="PowersBioStrikes")
-        new_followers = st.number_input("Current Followers", min_value=0, value=0)
-
-    new_notes = st.text_area("Notes", placeholder="Any notes about this account...", height=80)
-
-    if st.button("Add Account", type="primary"):
-        if new_username:
-            new_account = {
-                "id": datetime.now().strftime("%Y%m%d%H%M%S"),
-                "platform": new_platform,
-                "username": new_username,
-                "display_name": new_display_name or new_username,
-                "followers": new_followers,
-                "notes": new_notes,
-                "active": True,
-                "created_at": datetime.now().isoformat(),
-                "follower_history": [
-                    {"date": datetime.now().isoformat(), "count": new_followers}
-                ]
-            }
-            st.session_state.accounts.append(new_account)
-            save_accounts(st.session_state.accounts)
-            st.success(f"Added {PLATFORMS[new_platform]['name']} account: @{new_username}")
-            st.rerun()
-        else:
-            st.warning("Please enter a username!")
+        with col1:
+            new_platform = st.selectbox(
+                "Platform",
+                options=list(PLATFORMS.keys()),
+                format_func=lambda x: f"{PLATFORMS[x]['icon']} {PLATFORMS[x]['name']}"
+            )
+            new_username = st.text_input("Username (without @)", placeholder="PowersBioStrikes")
 
-st.markdown("<br>", unsafe_allow_html=True)
+        with col2:
+            new_display_name = st.text_input("Display Name", placeholder="PowersBioStrikes")
+            new_followers = st.number_input("Current Followers", min_value=0, value=0)
+
+        new_notes = st.text_area("Notes", placeholder="Any notes about this account...", height=80)
+
+        if st.button("Add Account", type="primary"):
+            if new_username:
+                # One instant for id, created_at, and the seed history point
+                new_account = {
+                    "id": _now.strftime("%Y%m%d%H%M%S"),
+                    "platform": new_platform,
+                    "username": new_username,
+                    "display_name": new_display_name or new_username,
+                    "followers": new_followers,
+                    "notes": new_notes,
+                    "active": True,
+                    "created_at": _now.isoformat()
+                }
+                accounts.append(new_account)
+                save_accounts(accounts)
+                append_follower_history([
+                    {"id": new_account['id'], "date": new_account['created_at'], "count": new_followers}
+                ])
+                st.success(f"Added {PLATFORMS[new_platform]['name']} account: @{new_username}")
+                st.rerun()
+            else:
+                st.warning("Please enter a username!")
 
-# ===== Account Cards =====
-section_header("Your Accounts")
 
-if accounts:
-    # Group by platform
-    accounts_by_platform = {}
-    for account in accounts:
-        platform = account.get('platform', 'other')
-        if platform not in accounts_by_platform:
-            accounts_by_platform[platform] = []
-        accounts_by_platform[platform].append(account)
-
-    for platform_key, platform_accounts in accounts_by_platform.items():
-        platform = PLATFORMS.get(platform_key, {"name": platform_key, "icon": "🔗", "color": COLORS['steel']})
-
-        st.markdown(f"""
-        <div style="color: {COLORS['gold']}; font-size: 1.1rem; font-weight: 600;
-                    margin: 20px 0 10px 0;">
-            {platform['icon']} {platform['name']}
-        </div>
-        """, unsafe_allow_html=True)
-
-        for account in platform_accounts:
-            status_color = COLORS['positive'] if account.get('active', True) else COLORS['text_muted']
-            profile_url = get_profile_url(platform_key, account.get('username', ''))
-
-            col1, col2 = st.columns([3, 1])
-
-            with col1:
-                st.markdown(f"""
-                <div style="background: {COLORS['bg_card']}; border: 1px solid {COLORS['steel']};
-                            border-left: 3px solid {platform.get('color', COLORS['gold'])};
-                            border-radius: 8px; padding: 20px; margin-bottom: 10px;">
-                    <div style="display: flex; justify-content: space-between; align-items: start;">
-                        <div>
-                            <div style="color: {COLORS['text_primary']}; font-size: 1.2rem; font-weight: 600;">
-                                {account.get('display_name', account.get('username', 'Unknown'))}
-                            </div>
-                            <div style="color: {COLORS['text_muted']}; font-size: 0.9rem;">
-                                @{account.get('username', 'unknown')}
-                            </div>
-                            <div style="color: {COLORS['gold']}; font-size: 1.1rem; margin-top: 10px;">
-                                {account.get('followers', 0):,} followers
-                            </div>
-                            {f'<div style="color: {COLORS["text_muted"]}; font-size: 0.85rem; margin-top: 5px;">{account.get("notes", "")}</div>' if account.get('notes') else ''}
-                        </div>
-                        <div style="display: flex; flex-direction: column; align-items: flex-end; gap: 10px;">
-                            <span style="background: {status_color}20; color: {status_color};
-                                        padding: 3px 10px; border-radius: 12px; font-size: 0.75rem;">
-                                {'Active' if account.get('active', True) else 'Inactive'}
-                            </span>
-                        </div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-
-            with col2:
-                st.markdown("<br>", unsafe_allow_html=True)
-
-                # Quick action buttons
-                btn_col1, btn_col2 = st.columns(2)
-
-                with btn_col1:
-                    login_url = platform.get('login_url', '#')
-                    st.markdown(f"""
-                    <a href="{login_url}" target="_blank" style="
-                        display: inline-block;
-                        background: {COLORS['steel_dark']};
-                        border: 1px solid {COLORS['steel']};
-                        color: {COLORS['text_secondary']};
-                        padding: 8px 12px;
-                        border-radius: 6px;
-                        text-decoration: none;
-                        font-size: 0.85rem;
-                        text-align: center;
-                        width: 100%;
-                    ">🔑 Login</a>
-                    """, unsafe_allow_html=True)
-
-                with btn_col2:
-                    if profile_url:
-                        st.markdown(f"""
-                        <a href="{profile_url}" target="_blank" style="
-                            display: inline-block;
-                            background: {COLORS['steel_dark']};
-                            border: 1px solid {COLORS['steel']};
-                            color: {COLORS['text_secondary']};
-                            padding: 8px 12px;
-                            border-radius: 6px;
-                            text-decoration: none;
-                            font-size: 0.85rem;
-                            text-align: center;
-                            width: 100%;
-                        ">👤 Profile</a>
-                        """, unsafe_allow_html=True)
-
-else:
+# ===== Empty State =====
+# No accounts yet: show only the add form and the empty-state card and
+# skip the stats pass, card rendering, and the follower/manage sections
+if not accounts:
+    _add_account_section()
     st.markdown(f"""
     <div style="background: {COLORS['bg_card']}; border: 1px solid {COLORS['steel']};
                 border-radius: 8px; padding: 40px; text-align: center;">
@@ -280,11 +318,97 @@ else:
         </div>
     </div>
     """, unsafe_allow_html=True)
+    st.stop()
+
+# ===== Quick Stats =====
+# One pass over the list instead of a filter, a sum, a set build, and a
+# separate grouping loop; defaultdict appends cost one dict lookup each
+active_count = 0
+total_followers = 0
+platforms_seen = set()
+accounts_by_platform = defaultdict(list)
+for a in accounts:
+    accounts_by_platform[a.get('platform', 'other')].append(a)
+    if a.get('active', True):
+        active_count += 1
+        total_followers += a.get('followers', 0)
+        platforms_seen.add(a.get('platform'))
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    metric_card("Active Accounts", str(active_count))
+with col2:
+    metric_card("Total Followers", f"{total_followers:,}")
+with col3:
+    metric_card("Platforms", str(len(platforms_seen)))
+
+st.markdown("<br>", unsafe_allow_html=True)
+
+# ===== Add New Account =====
+_add_account_section()
+
+st.markdown("<br>", unsafe_allow_html=True)
+
+# ===== Account Cards =====
+section_header("Your Accounts")
+
+# Grouping already done in the Quick Stats pass above
+for platform_key, platform_accounts in accounts_by_platform.items():
+    platform = PLATFORMS.get(platform_key, {"name": platform_key, "icon": "🔗", "color": _STEEL})
+
+    # One markdown call per platform group instead of several
+    # Streamlit calls per account: O(platforms) frontend messages
+    html_parts = [_PLATFORM_HEADER_TMPL.format_map({
+        'icon': platform['icon'],
+        'name': platform['name'],
+    })]
+
+    for account in platform_accounts:
+        active = account.get('active', True)
+        status_color = _POSITIVE if active else _TEXT_MUTED
+        profile_url = get_profile_url(platform_key, account.get('username', ''))
+        notes = account.get('notes', '')
+
+        card_html = _ACCOUNT_CARD_TMPL.format_map({
+            'border_color': platform.get('color', _GOLD),
+            'display_name': account.get('display_name', account.get('username', 'Unknown')),
+            'username': account.get('username', 'unknown'),
+            'followers': f"{account.get('followers', 0):,}",
+            'notes_html': _NOTES_TMPL.format_map({'notes': notes}) if notes else '',
+            'status_color': status_color,
+            'status_label': 'Active' if active else 'Inactive',
+        })
+
+        # Quick action links are plain anchors, so they batch too;
+        # unknown platforms fall back to formatting on the spot
+        buttons = [platform.get('_login_html') or _LINK_BTN_TMPL.format_map({
+            'href': platform.get('login_url', '#'),
+            'label': '🔑 Login',
+        })]
+        if profile_url:
+            buttons.append(_LINK_BTN_TMPL.format_map({
+                'href': profile_url,
+                'label': '👤 Profile',
+            }))
+
+        # CSS grid stands in for the old st.columns([3, 1]) split
+        # without any Streamlit layout containers
+        html_parts.append(
+            '<div style="display: grid; grid-template-columns: 3fr 1fr; gap: 10px; align-items: start;">'
+            f'{card_html}'
+            f'<div style="display: flex; flex-direction: column; gap: 10px; padding-top: 20px;">{"".join(buttons)}</div>'
+            '</div>'
+        )
+
+    st.markdown("".join(html_parts), unsafe_allow_html=True)
 
 st.markdown("<br><br>", unsafe_allow_html=True)
 
 # ===== Update Followers Section =====
-if accounts:
+@_fragment
+def _update_followers_section():
+    # Fragment: typing in the number inputs reruns only this form, not
+    # the card rendering and grouping above
     section_header("Update Follower Counts")
 
     st.markdown(f"""
@@ -310,21 +434,33 @@ if accounts:
                 )
 
         if st.form_submit_button("Update All", type="primary"):
-            for account in st.session_state.accounts:
+            # Only rewrite the file (and rerun) when a count changed;
+            # history points append to the JSONL log so the accounts
+            # file stays small no matter how long tracking runs
+            now_iso = datetime.now().isoformat()  # one instant per submit
+            history_entries = []
+            for account in accounts:
                 if account['id'] in updates:
                     new_count = updates[account['id']]
                     if new_count != account.get('followers', 0):
                         account['followers'] = new_count
-                        if 'follower_history' not in account:
-                            account['follower_history'] = []
-                        account['follower_history'].append({
-                            "date": datetime.now().isoformat(),
+                        history_entries.append({
+                            "id": account['id'],
+                            "date": now_iso,
                             "count": new_count
                         })
 
-            save_accounts(st.session_state.accounts)
-            st.success("Follower counts updated!")
-            st.rerun()
+            if history_entries:
+                append_follower_history(history_entries)
+                save_accounts(accounts)
+                st.success("Follower counts updated!")
+                st.rerun()
+            else:
+                st.info("No changes to save.")
+
+
+# Unreachable with zero accounts thanks to the empty-state st.stop()
+_update_followers_section()
 
 st.markdown("<br><br>", unsafe_allow_html=True)
 
@@ -352,16 +488,25 @@ with st.expander("🔐 Recommended Password Managers"):
     """)
 
 # ===== Manage Accounts =====
-st.markdown("<br>", unsafe_allow_html=True)
+@_fragment
+def _manage_accounts_section():
+    # Fragment for the same reason as the update form: widget changes
+    # in here don't re-render the account cards
+    with st.expander("⚙️ Manage Accounts"):
+        if not accounts:
+            st.info("No accounts to manage yet.")
+            return
+
+        # id -> account map: O(1) lookups in the format_func and the
+        # toggle handler instead of a linear scan per option
+        accounts_by_id = {a['id']: a for a in accounts}
 
-with st.expander("⚙️ Manage Accounts"):
-    if accounts:
         account_to_delete = st.selectbox(
             "Select account to manage",
-            options=[a['id'] for a in accounts],
-            format_func=lambda x: next(
-                f"{PLATFORMS.get(a['platform'], {}).get('icon', '🔗')} @{a['username']}"
-                for a in accounts if a['id'] == x
+            options=list(accounts_by_id),
+            format_func=lambda x: (
+                f"{PLATFORMS.get(accounts_by_id[x]['platform'], {}).get('icon', '🔗')}"
+                f" @{accounts_by_id[x]['username']}"
             )
         )
 
@@ -369,17 +514,18 @@ with st.expander("⚙️ Manage Accounts"):
 
         with col1:
             if st.button("Toggle Active/Inactive", use_container_width=True):
-                for account in st.session_state.accounts:
-                    if account['id'] == account_to_delete:
-                        account['active'] = not account.get('active', True)
-                save_accounts(st.session_state.accounts)
+                account = accounts_by_id[account_to_delete]
+                account['active'] = not account.get('active', True)
+                save_accounts(accounts)
                 st.rerun()
 
         with col2:
             if st.button("🗑️ Delete Account", use_container_width=True, type="secondary"):
-                st.session_state.accounts = [a for a in st.session_state.accounts if a['id'] != account_to_delete]
-                save_accounts(st.session_state.accounts)
+                accounts[:] = [a for a in accounts if a['id'] != account_to_delete]
+                save_accounts(accounts)
                 st.success("Account deleted!")
                 st.rerun()
-    else:
-        st.info("No accounts to manage yet.")
+
+
+st.markdown("<br>", unsafe_allow_html=True)
+_manage_accounts_section()
@@ -4,12 +4,33 @@ Content calendar, posting reminders, and activity tracking.
 """
 
 import streamlit as st
-from datetime import datetime, timedelta
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+import heapq
 import json
 import os
 import sys
+import uuid
 import calendar
 
+# orjson parses/serializes several times faster than stdlib json; fall
+# back to stdlib if it isn't installed.
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(data):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(data):
+        return json.dumps(data, indent=2, default=str).encode('utf-8')
+
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -23,9 +44,19 @@ except:
 
 sidebar_branding()
 
+# st.fragment (Streamlit >= 1.37) scopes reruns triggered inside the
+# decorated section to that section instead of re-running the whole
+# script; no-op on older versions.
+try:
+    _fragment = st.fragment
+except AttributeError:
+    def _fragment(func):
+        return func
+
 # ===== Constants =====
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
 POSTS_FILE = os.path.join(DATA_DIR, 'posts.json')
+POSTS_JSONL = os.path.join(DATA_DIR, 'posts.jsonl')
 SCHEDULE_FILE = os.path.join(DATA_DIR, 'schedule.json')
 
 # Recommended posting frequency
@@ -48,35 +79,144 @@ POSTING_GUIDELINES = {
     }
 }
 
+# The guidelines are constants, so join the display strings once at
+# import instead of twice per platform per rerun
+for _g in POSTING_GUIDELINES.values():
+    _g['best_times_str'] = ', '.join(_g['best_times'])
+    _g['best_days_str'] = ', '.join(_g['best_days'])
+
+# Colors read per cell by the calendar loop (up to 42 iterations per
+# render), bound once so each use skips the dict subscription
+_MAHOGANY_DARK = COLORS['mahogany_dark']
+_BG_CARD = COLORS['bg_card']
+_GOLD = COLORS['gold']
+_STEEL = COLORS['steel']
+_POSITIVE = COLORS['positive']
+_TEXT_PRIMARY = COLORS['text_primary']
+
+# Only four dot patterns exist (0-3 dots); precompute them instead of
+# building and joining a list per active cell
+_DOT = f'<span style="color: {_POSITIVE};">●</span>'
+_DOTS = ('', _DOT, _DOT * 2, _DOT * 3)
+
+# Static day-header row of the calendar grid, built once at import
+_DAY_HEADERS_HTML = ''.join(
+    f"""<div style="text-align: center; color: {COLORS['text_muted']};
+                font-weight: 600; padding: 10px 0;">{day}</div>"""
+    for day in ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+)
+
+# Idea-card lookup tables, built once instead of per loop iteration
+_PLATFORM_EMOJI = {"twitter": "🐦", "reddit": "📝", "both": "🔄"}
+_TYPE_LABEL = {k: k.replace('_', ' ').title()
+               for k in ('trade_alert', 'educational', 'track_record', 'engagement', 'other')}
+
+# Theme colors baked in at import; only per-item values go through
+# format_map at render time
+_IDEA_CARD_TMPL = f"""
+<div style="background: {COLORS['bg_card']}; border: 1px solid {_STEEL};
+            border-radius: 8px; padding: 15px; margin-bottom: 10px;">
+    <div style="display: flex; align-items: center; gap: 10px; margin-bottom: 5px;">
+        <span>{{platform_emoji}}</span>
+        <span style="color: {_TEXT_PRIMARY}; font-weight: 600;">
+            {{title}}
+        </span>
+        <span style="background: {COLORS['steel_dark']}; color: {COLORS['text_muted']};
+                    padding: 2px 8px; border-radius: 4px; font-size: 0.75rem;">
+            {{type_label}}
+        </span>
+    </div>
+    <div style="color: {COLORS['text_muted']}; font-size: 0.9rem;">
+        {{notes}}
+    </div>
+</div>
+"""
+
+_RECENT_ROW_TMPL = f"""
+<div style="display: flex; align-items: center; gap: 15px; padding: 10px 0;
+            border-bottom: 1px solid {COLORS['steel_dark']};">
+    <span style="font-size: 1.2rem;">{{platform_emoji}}</span>
+    <div style="flex: 1;">
+        <div style="color: {_TEXT_PRIMARY};">
+            {{title}}...
+        </div>
+    </div>
+    <div style="color: {COLORS['text_muted']}; font-size: 0.85rem;">
+        {{post_date}}
+    </div>
+</div>
+"""
+
+
 # ===== Helper Functions =====
+@lru_cache(maxsize=64)
+def _monthcal(year, month):
+    # monthcalendar allocates nested week lists; only a handful of
+    # (year, month) pairs ever show up, so memoize them
+    return calendar.monthcalendar(year, month)
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+@st.cache_data(show_spinner=False)
+def _load_posts_cached(json_mtime, jsonl_mtime):
+    """Read the legacy posts.json array plus the append-only posts.jsonl
+    log the generator pages write to. Cached on both mtimes so reruns
+    skip the disk reads and parses unless a file changed."""
+    posts = []
+    if json_mtime is not None:
+        with open(POSTS_FILE, 'rb') as f:
+            posts = _json_loads(f.read())
+    if jsonl_mtime is not None:
+        with open(POSTS_JSONL, 'rb') as f:
+            posts.extend(_json_loads(line) for line in f if line.strip())
+    return posts
+
 def load_posts():
-    if os.path.exists(POSTS_FILE):
-        with open(POSTS_FILE, 'r') as f:
-            return json.load(f)
-    return []
+    return _load_posts_cached(_mtime(POSTS_FILE), _mtime(POSTS_JSONL))
 
-def load_schedule():
-    if os.path.exists(SCHEDULE_FILE):
-        with open(SCHEDULE_FILE, 'r') as f:
-            return json.load(f)
+@st.cache_data(show_spinner=False)
+def _load_schedule_cached(mtime):
+    if mtime is not None:
+        with open(SCHEDULE_FILE, 'rb') as f:
+            return _json_loads(f.read())
     return {"reminders": [], "content_ideas": []}
 
+def load_schedule():
+    return _load_schedule_cached(_mtime(SCHEDULE_FILE))
+
 def save_schedule(schedule):
     os.makedirs(DATA_DIR, exist_ok=True)
-    with open(SCHEDULE_FILE, 'w') as f:
-        json.dump(schedule, f, indent=2, default=str)
-
-def get_posts_by_date(posts, date):
-    """Get posts for a specific date."""
-    date_str = date.strftime("%Y-%m-%d")
-    return [p for p in posts if p.get('date', '')[:10] == date_str]
+    with open(SCHEDULE_FILE, 'wb') as f:
+        f.write(_json_dumps(schedule))
+    _load_schedule_cached.clear()
+
+@st.cache_data(show_spinner=False)
+def _post_buckets(json_mtime, jsonl_mtime):
+    """Bucket posts by ISO day in one pass, cached alongside the loader.
+    The calendar previously rescanned the full post list per cell (up to
+    42 scans per render); with the buckets each cell is a dict lookup."""
+    posts_by_date = defaultdict(list)
+    posted_count_by_date = defaultdict(int)
+    for p in _load_posts_cached(json_mtime, jsonl_mtime):
+        day = p.get('date', '')[:10]
+        posts_by_date[day].append(p)
+        if p.get('status') == 'posted':
+            posted_count_by_date[day] += 1
+    return dict(posts_by_date), dict(posted_count_by_date)
 
 def get_posts_this_week(posts):
-    """Get posts from the current week."""
-    today = datetime.now()
-    week_start = today - timedelta(days=today.weekday())
-    return [p for p in posts
-            if p.get('date') and datetime.fromisoformat(p['date'][:19]) >= week_start]
+    """Get posts from the current week.
+
+    ISO timestamps sort lexicographically, so a plain string comparison
+    against the week-start date replaces fromisoformat on every post.
+    """
+    today = datetime.now().date()
+    week_start_iso = (today - timedelta(days=today.weekday())).isoformat()
+    return [p for p in posts if p.get('date', '') >= week_start_iso]
 
 def calculate_streak(posts, platform=None):
     """Calculate current posting streak in days."""
@@ -86,26 +226,61 @@ def calculate_streak(posts, platform=None):
     if not posts:
         return 0
 
-    # Sort by date descending
-    sorted_posts = sorted(posts, key=lambda x: x.get('date', ''), reverse=True)
+    # The walk only needs membership in "days with a post", so build a
+    # set of day ordinals (int slicing is several times cheaper than
+    # fromisoformat) and count backward from today: O(n) set build plus
+    # O(streak) walk instead of an O(n log n) sort
+    posted_ordinals = set()
+    for post in posts:
+        s = post['date']
+        posted_ordinals.add(date(int(s[0:4]), int(s[5:7]), int(s[8:10])).toordinal())
 
-    streak = 0
-    current_date = datetime.now().date()
+    o = date.today().toordinal()
+    if o not in posted_ordinals:
+        o -= 1  # a streak ending yesterday still counts until today's post
 
-    for post in sorted_posts:
-        post_date = datetime.fromisoformat(post['date'][:10]).date()
-        if post_date == current_date or post_date == current_date - timedelta(days=1):
-            streak += 1
-            current_date = post_date - timedelta(days=1)
-        elif post_date < current_date - timedelta(days=1):
-            break
+    streak = 0
+    while o in posted_ordinals:
+        streak += 1
+        o -= 1
 
     return streak
 
+@st.cache_data(show_spinner=False)
+def _recent_posted(json_mtime, jsonl_mtime, n=10):
+    """Most recent posted posts; recomputed only when a post file
+    changes, and as a partial sort — O(n log 10) rather than sorting the
+    whole history to keep ten entries."""
+    return heapq.nlargest(
+        n,
+        (p for p in _load_posts_cached(json_mtime, jsonl_mtime) if p.get('status') == 'posted'),
+        key=lambda x: x.get('date', '')
+    )
+
+@st.cache_data(show_spinner=False)
+def _active_ideas_sorted(mtime):
+    """Unused content ideas newest-first; re-sorted only when the
+    schedule file changes."""
+    return sorted(
+        (i for i in _load_schedule_cached(mtime).get('content_ideas', []) if not i.get('used', False)),
+        key=lambda x: x.get('created_at', ''),
+        reverse=True
+    )
+
+@st.cache_data(show_spinner=False)
+def _streak_cached(json_mtime, jsonl_mtime, today_ordinal, platform=None):
+    """Streak memoized on the post files and the current day: reruns
+    within the same day reuse the answer instead of re-filtering and
+    re-sorting the whole history."""
+    posted = [p for p in _load_posts_cached(json_mtime, jsonl_mtime)
+              if p.get('status') == 'posted']
+    return calculate_streak(posted, platform)
+
 
 # ===== Load Data =====
 posts = load_posts()
 schedule = load_schedule()
+posts_by_date, posted_count_by_date = _post_buckets(_mtime(POSTS_FILE), _mtime(POSTS_JSONL))
 
 
 # ===== Main Content =====
@@ -121,8 +296,12 @@ st.markdown(f"""
 section_header("This Week's Activity")
 
 posts_this_week = get_posts_this_week(posts)
-twitter_this_week = len([p for p in posts_this_week if p.get('platform') == 'twitter' and p.get('status') == 'posted'])
-reddit_this_week = len([p for p in posts_this_week if p.get('platform') == 'reddit' and p.get('status') == 'posted'])
+# One pass over the week's posts instead of one scan per platform
+week_counts = Counter(
+    p.get('platform') for p in posts_this_week if p.get('status') == 'posted'
+)
+twitter_this_week = week_counts['twitter']
+reddit_this_week = week_counts['reddit']
 
 col1, col2, col3, col4 = st.columns(4)
 
@@ -145,11 +324,14 @@ with col2:
     )
 
 with col3:
-    streak = calculate_streak([p for p in posts if p.get('status') == 'posted'])
+    streak = _streak_cached(_mtime(POSTS_FILE), _mtime(POSTS_JSONL), date.today().toordinal())
     metric_card("Current Streak", f"{streak} days")
 
 with col4:
-    total_posts = len([p for p in posts if p.get('status') == 'posted'])
+    # The day buckets already counted every posted post; summing them
+    # avoids another full-list filter (the streak's throwaway filtered
+    # list went away with the cached streak helper)
+    total_posts = sum(posted_count_by_date.values())
     metric_card("All-Time Posts", str(total_posts))
 
 st.markdown("<br>", unsafe_allow_html=True)
@@ -179,7 +361,7 @@ with col2:
 
 with col1:
     # Generate calendar
-    cal = calendar.monthcalendar(view_year, view_month)
+    cal = _monthcal(view_year, view_month)
 
     # Calendar header
     st.markdown(f"""
@@ -190,56 +372,53 @@ with col1:
     </div>
     """, unsafe_allow_html=True)
 
-    # Day headers
-    days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-    header_cols = st.columns(7)
-    for i, day in enumerate(days):
-        with header_cols[i]:
-            st.markdown(f"""
-            <div style="text-align: center; color: {COLORS['text_muted']};
-                        font-weight: 600; padding: 10px 0;">
-                {day}
-            </div>
-            """, unsafe_allow_html=True)
+    # Whole grid as one HTML string: one frontend message instead of a
+    # st.columns(7) per week plus a st.markdown per cell (~50 calls)
+    cells = [_DAY_HEADERS_HTML]
+    today_d = today.date()  # one date object for all 42 comparisons
 
-    # Calendar weeks
     for week in cal:
-        week_cols = st.columns(7)
-        for i, day in enumerate(week):
-            with week_cols[i]:
-                if day == 0:
-                    st.markdown("<div style='height: 80px;'></div>", unsafe_allow_html=True)
-                else:
-                    date = datetime(view_year, view_month, day)
-                    day_posts = get_posts_by_date(posts, date)
-                    posted_count = len([p for p in day_posts if p.get('status') == 'posted'])
-
-                    is_today = date.date() == today.date()
-                    is_future = date.date() > today.date()
-
-                    bg_color = COLORS['mahogany_dark'] if is_today else COLORS['bg_card']
-                    border_color = COLORS['gold'] if is_today else COLORS['steel']
-
-                    # Activity indicator
-                    activity = ""
-                    if posted_count > 0:
-                        activity = f"""
-                        <div style="display: flex; justify-content: center; gap: 3px; margin-top: 5px;">
-                            {''.join(['<span style="color: ' + COLORS['positive'] + ';">●</span>' for _ in range(min(posted_count, 3))])}
-                            {f'<span style="color: {COLORS["positive"]};">+{posted_count - 3}</span>' if posted_count > 3 else ''}
-                        </div>
-                        """
-
-                    st.markdown(f"""
-                    <div style="background: {bg_color}; border: 1px solid {border_color};
-                                border-radius: 8px; padding: 10px; height: 80px;
-                                text-align: center; opacity: {'0.5' if is_future else '1'};">
-                        <div style="color: {COLORS['text_primary']}; font-weight: {'700' if is_today else '400'};">
-                            {day}
-                        </div>
-                        {activity}
-                    </div>
-                    """, unsafe_allow_html=True)
+        for day in week:
+            if day == 0:
+                cells.append("<div style='height: 80px;'></div>")
+                continue
+
+            # Plain date object and an f-string key: no datetime
+            # construction or strftime per cell
+            d = date(view_year, view_month, day)
+            posted_count = posted_count_by_date.get(f"{view_year:04d}-{view_month:02d}-{day:02d}", 0)
+
+            is_today = d == today_d
+            is_future = d > today_d
+
+            bg_color = _MAHOGANY_DARK if is_today else _BG_CARD
+            border_color = _GOLD if is_today else _STEEL
+
+            # Activity indicator
+            activity = ""
+            if posted_count > 0:
+                overflow = f'<span style="color: {_POSITIVE};">+{posted_count - 3}</span>' if posted_count > 3 else ''
+                activity = (
+                    '<div style="display: flex; justify-content: center; gap: 3px; margin-top: 5px;">'
+                    f'{_DOTS[min(posted_count, 3)]}{overflow}</div>'
+                )
+
+            cells.append(f"""
+            <div style="background: {bg_color}; border: 1px solid {border_color};
+                        border-radius: 8px; padding: 10px; height: 80px;
+                        text-align: center; opacity: {'0.5' if is_future else '1'};">
+                <div style="color: {_TEXT_PRIMARY}; font-weight: {'700' if is_today else '400'};">
+                    {day}
+                </div>
+                {activity}
+            </div>
+            """)
+
+    st.markdown(
+        '<div style="display: grid; grid-template-columns: repeat(7, 1fr); gap: 8px;">'
+        + ''.join(cells) + '</div>',
+        unsafe_allow_html=True
+    )
 
 st.markdown("<br><br>", unsafe_allow_html=True)
 
@@ -252,8 +431,7 @@ for i, (platform_key, guidelines) in enumerate(POSTING_GUIDELINES.items()):
     col = col1 if i == 0 else col2
 
     with col:
-        platform_posts = [p for p in posts_this_week if p.get('platform') == platform_key and p.get('status') == 'posted']
-        current_count = len(platform_posts)
+        current_count = week_counts[platform_key]
         goal = guidelines['recommended_per_week']
         remaining = max(0, goal - current_count)
 
@@ -280,10 +458,10 @@ for i, (platform_key, guidelines) in enumerate(POSTING_GUIDELINES.items()):
 
             <div style="color: {COLORS['text_muted']}; font-size: 0.85rem;">
                 <div style="margin-bottom: 8px;">
-                    <strong>Best times:</strong> {', '.join(guidelines['best_times'])}
+                    <strong>Best times:</strong> {guidelines['best_times_str']}
                 </div>
                 <div style="margin-bottom: 8px;">
-                    <strong>Best days:</strong> {', '.join(guidelines['best_days'])}
+                    <strong>Best days:</strong> {guidelines['best_days_str']}
                 </div>
                 <div>
                     <strong>Remaining:</strong> {remaining} posts to hit goal
@@ -327,7 +505,7 @@ with st.expander("➕ Add Content Idea"):
     if st.button("Save Idea", type="primary"):
         if idea_title:
             new_idea = {
-                "id": datetime.now().strftime("%Y%m%d%H%M%S"),
+                "id": uuid.uuid4().hex,
                 "platform": idea_platform,
                 "type": idea_type,
                 "title": idea_title,
@@ -343,39 +521,29 @@ with st.expander("➕ Add Content Idea"):
             st.warning("Please add a title!")
 
 # Display existing ideas
-ideas = [i for i in schedule.get('content_ideas', []) if not i.get('used', False)]
+ideas = _active_ideas_sorted(_mtime(SCHEDULE_FILE))
 
 if ideas:
-    for idea in sorted(ideas, key=lambda x: x.get('created_at', ''), reverse=True):
-        platform_emoji = {"twitter": "🐦", "reddit": "📝", "both": "🔄"}.get(idea.get('platform', ''), "📄")
+    # The cached view holds copies, so the Used handler flips the flag
+    # on the canonical schedule entry via this id map
+    ideas_by_id = {i['id']: i for i in schedule.get('content_ideas', [])}
+    for idea in ideas:
+        platform_emoji = _PLATFORM_EMOJI.get(idea.get('platform', ''), "📄")
 
         col1, col2 = st.columns([4, 1])
 
         with col1:
-            st.markdown(f"""
-            <div style="background: {COLORS['bg_card']}; border: 1px solid {COLORS['steel']};
-                        border-radius: 8px; padding: 15px; margin-bottom: 10px;">
-                <div style="display: flex; align-items: center; gap: 10px; margin-bottom: 5px;">
-                    <span>{platform_emoji}</span>
-                    <span style="color: {COLORS['text_primary']}; font-weight: 600;">
-                        {idea.get('title', 'Untitled')}
-                    </span>
-                    <span style="background: {COLORS['steel_dark']}; color: {COLORS['text_muted']};
-                                padding: 2px 8px; border-radius: 4px; font-size: 0.75rem;">
-                        {idea.get('type', 'other').replace('_', ' ').title()}
-                    </span>
-                </div>
-                <div style="color: {COLORS['text_muted']}; font-size: 0.9rem;">
-                    {idea.get('notes', '')[:100]}{'...' if len(idea.get('notes', '')) > 100 else ''}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            notes = idea.get('notes', '')
+            st.markdown(_IDEA_CARD_TMPL.format_map({
+                'platform_emoji': platform_emoji,
+                'title': idea.get('title', 'Untitled'),
+                'type_label': _TYPE_LABEL.get(idea.get('type', 'other'), 'Other'),
+                'notes': notes[:100] + ('...' if len(notes) > 100 else ''),
+            }), unsafe_allow_html=True)
 
         with col2:
             if st.button("✅ Used", key=f"used_{idea['id']}"):
-                for i in schedule['content_ideas']:
-                    if i['id'] == idea['id']:
-                        i['used'] = True
+                ideas_by_id[idea['id']]['used'] = True
                 save_schedule(schedule)
                 st.rerun()
 else:
@@ -384,35 +552,33 @@ else:
 st.markdown("<br><br>", unsafe_allow_html=True)
 
 # ===== Recent Activity Log =====
-section_header("Recent Activity")
-
-recent_posts = sorted(
-    [p for p in posts if p.get('status') == 'posted'],
-    key=lambda x: x.get('date', ''),
-    reverse=True
-)[:10]
-
-if recent_posts:
-    for post in recent_posts:
-        platform_emoji = "🐦" if post.get('platform') == 'twitter' else "📝"
-        post_date = post.get('date', '')[:10]
-
-        st.markdown(f"""
-        <div style="display: flex; align-items: center; gap: 15px; padding: 10px 0;
-                    border-bottom: 1px solid {COLORS['steel_dark']};">
-            <span style="font-size: 1.2rem;">{platform_emoji}</span>
-            <div style="flex: 1;">
-                <div style="color: {COLORS['text_primary']};">
-                    {post.get('title', post.get('content', '')[:50])}...
-                </div>
-            </div>
-            <div style="color: {COLORS['text_muted']}; font-size: 0.85rem;">
-                {post_date}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-else:
-    st.info("No posts yet. Start creating content to build your track record!")
+@_fragment
+def _recent_activity_section():
+    # Off by default: reruns spent navigating the calendar skip the
+    # recent-posts fetch and row rendering entirely, and toggling it on
+    # reruns only this fragment
+    section_header("Recent Activity")
+
+    if not st.checkbox("Show recent activity", key="show_recent"):
+        return
+
+    recent_posts = _recent_posted(_mtime(POSTS_FILE), _mtime(POSTS_JSONL))
+
+    if recent_posts:
+        # One markdown call for the whole list instead of one per row
+        st.markdown(''.join(
+            _RECENT_ROW_TMPL.format_map({
+                'platform_emoji': "🐦" if post.get('platform') == 'twitter' else "📝",
+                'title': post.get('title', post.get('content', '')[:50]),
+                'post_date': post.get('date', '')[:10],
+            })
+            for post in recent_posts
+        ), unsafe_allow_html=True)
+    else:
+        st.info("No posts yet. Start creating content to build your track record!")
+
+
+_recent_activity_section()
 
 # ===== Footer Tips =====
 st.markdown("<br><br>", unsafe_allow_html=True)
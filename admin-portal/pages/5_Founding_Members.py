@@ -4,10 +4,14 @@ Track and manage your founding member signups.
 """
 
 import streamlit as st
-from datetime import datetime, timedelta
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+import itertools
 import json
 import os
 import sys
+import time
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -25,52 +29,196 @@ sidebar_branding()
 # ===== Constants =====
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
 MEMBERS_FILE = os.path.join(DATA_DIR, 'founding_members.json')
+MEMBERS_JSONL = os.path.join(DATA_DIR, 'founding_members.jsonl')
+
 MAX_FOUNDING_MEMBERS = 100
 
+# Hot theme colors bound once; the per-member f-strings below then do a
+# plain name load instead of a dict subscript per field
+_GOLD = COLORS['gold']
+_STEEL = COLORS['steel']
+_BG_CARD = COLORS['bg_card']
+_TEXT_PRIMARY = COLORS['text_primary']
+_TEXT_MUTED = COLORS['text_muted']
+_POSITIVE = COLORS['positive']
+_WARNING = COLORS['warning']
+
+# Member ids: nanosecond-seeded counter. Unlike the old second-resolution
+# strftime ids, consecutive draws (e.g. a multi-member import) can't
+# collide, and drawing one is just an integer increment
+_id_counter = itertools.count(time.time_ns())
+
+def _next_member_id():
+    return str(next(_id_counter))
+
+# Built once instead of per member per rerun
+_SOURCE_EMOJI = {
+    "landing_page": "🌐",
+    "twitter": "🐦",
+    "reddit": "📝",
+    "referral": "🤝",
+    "direct": "📧",
+    "other": "📌"
+}
+
+# ===== Static HTML (theme colors interpolated once at import; only the
+# per-rerun values go through format_map) =====
+_INTRO_HTML = f"""
+<p style="color: {COLORS['text_secondary']}; margin-bottom: 30px;">
+    Track your Founding Member signups and manage early supporters.
+</p>
+"""
+
+_PROGRESS_TMPL = f"""
+<div style="margin-bottom: 30px;">
+    <div style="display: flex; justify-content: space-between; margin-bottom: 8px;">
+        <span style="color: {COLORS['text_muted']}; font-size: 0.9rem;">Founding Member Spots Filled</span>
+        <span style="color: {COLORS['gold']}; font-weight: 600;">{{total_members}}/{MAX_FOUNDING_MEMBERS}</span>
+    </div>
+    <div style="background: {COLORS['bg_dark']}; border-radius: 10px; height: 12px; overflow: hidden;">
+        <div style="background: linear-gradient(90deg, {COLORS['gold']}, {{progress_color}});
+                    width: {{progress_pct}}%; height: 100%; border-radius: 10px;
+                    transition: width 0.3s ease;"></div>
+    </div>
+</div>
+"""
+
+_EMPTY_STATE_HTML = f"""
+<div style="background: {COLORS['bg_card']}; border: 1px solid {COLORS['steel']};
+            border-radius: 8px; padding: 40px; text-align: center;">
+    <div style="font-size: 3rem; margin-bottom: 15px;">🏆</div>
+    <div style="color: {COLORS['text_primary']}; font-size: 1.2rem; margin-bottom: 10px;">
+        No Founding Members Yet
+    </div>
+    <div style="color: {COLORS['text_muted']};">
+        Founding members will appear here as they sign up through the landing page.
+    </div>
+</div>
+"""
+
+_IMPORT_INFO_HTML = f"""
+<div style="background: {COLORS['mahogany_dark']}; border: 1px solid {COLORS['steel']};
+            border-radius: 8px; padding: 20px; margin-bottom: 20px;">
+    <div style="color: {COLORS['gold']}; font-weight: 600; margin-bottom: 10px;">
+        📥 Import from Landing Page
+    </div>
+    <div style="color: {COLORS['text_muted']}; font-size: 0.9rem; margin-bottom: 15px;">
+        To import founding members from your landing page, open your browser's Developer Tools (F12) on the landing page,
+        go to Console, and run: <code style="background: {COLORS['bg_dark']}; padding: 2px 6px; border-radius: 4px;">
+        copy(localStorage.getItem('pbs_founding_members'))</code>
+        <br><br>
+        Then paste the JSON data below:
+    </div>
+</div>
+"""
+
 # ===== Helper Functions =====
-def load_members():
-    if os.path.exists(MEMBERS_FILE):
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+@st.cache_data(show_spinner=False)
+def _load_members_cached(json_mtime, jsonl_mtime):
+    """Parse the member files once per on-disk version; the mtime
+    arguments are the cache key, so edits on disk invalidate it."""
+    members = []
+    try:
         with open(MEMBERS_FILE, 'r') as f:
-            return json.load(f)
-    return []
+            members = json.load(f)
+    except FileNotFoundError:
+        pass
+    try:
+        with open(MEMBERS_JSONL, 'r') as f:
+            members.extend(json.loads(line) for line in f if line.strip())
+    except FileNotFoundError:
+        pass
+    return members
 
-def save_members(members):
+def load_members():
+    """Load the member archive plus any members appended to the JSONL
+    log since the last compaction (same scheme as posts.jsonl)."""
+    return _load_members_cached(_mtime(MEMBERS_FILE), _mtime(MEMBERS_JSONL))
+
+def append_member(member):
+    """Record a single new member as one appended JSONL line — O(1)
+    regardless of how many members already exist."""
     os.makedirs(DATA_DIR, exist_ok=True)
-    with open(MEMBERS_FILE, 'w') as f:
-        json.dump(members, f, indent=2, default=str)
+    with open(MEMBERS_JSONL, 'a') as f:
+        f.write(json.dumps(member) + '\n')
+    _load_members_cached.clear()
 
-def calculate_free_months_remaining(signup_date_str):
-    """Calculate how many free months remain for a founding member."""
+def save_members(members):
+    """Compact the full member list into the archive file (atomically,
+    via a temp file) and drop the JSONL log it absorbs. Used for
+    mutations of existing members and bulk imports."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    # Compact output, no default= fallback: the member dicts are plain
+    # JSON types already, and the pretty copy exists via Export
+    tmp_path = MEMBERS_FILE + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(members, f)
+    os.replace(tmp_path, MEMBERS_FILE)
+    try:
+        os.remove(MEMBERS_JSONL)
+    except FileNotFoundError:
+        pass
+    _load_members_cached.clear()
+
+# One clock read per rerun; every free-months computation below reuses it
+_NOW_ORDINAL = datetime.now().toordinal()
+
+# Earliest signup date that still has free months: 179 days back is the
+# last day where (elapsed_days // 30) < 6. ISO strings on or after this
+# date compare greater-or-equal lexicographically
+_FREE_CUTOFF_ISO = date.fromordinal(_NOW_ORDINAL - 179).isoformat()
+
+@lru_cache(maxsize=512)
+def _free_months(signup_date_str, now_ordinal):
+    """Memoized core of the free-months calculation. Each signup date is
+    parsed once per process instead of twice per member per rerun; the
+    day count is plain integer subtraction on ordinals."""
     try:
-        signup_date = datetime.fromisoformat(signup_date_str[:19])
-        months_elapsed = (datetime.now() - signup_date).days / 30
-        remaining = max(0, 6 - int(months_elapsed))
-        return remaining
+        signup_ordinal = datetime.fromisoformat(signup_date_str[:19]).toordinal()
+        return max(0, 6 - (now_ordinal - signup_ordinal) // 30)
     except:
         return 6
 
+def calculate_free_months_remaining(signup_date_str):
+    """Calculate how many free months remain for a founding member."""
+    return _free_months(signup_date_str, _NOW_ORDINAL)
+
 
 # ===== Load Data =====
 if 'founding_members' not in st.session_state:
     st.session_state.founding_members = load_members()
+    # id -> member index over the same dicts as the list, so the button
+    # handlers can update a member in O(1) instead of scanning the list
+    st.session_state.members_by_id = {m.get('id'): m for m in st.session_state.founding_members}
+    # Email set for O(1) duplicate checks in the add and import paths
+    st.session_state.member_emails = {m.get('email') for m in st.session_state.founding_members if m.get('email')}
 
 members = st.session_state.founding_members
+members_by_id = st.session_state.members_by_id
+member_emails = st.session_state.member_emails
 
 
 # ===== Main Content =====
 st.title("🏆 Founding Members")
 
-st.markdown(f"""
-<p style="color: {COLORS['text_secondary']}; margin-bottom: 30px;">
-    Track your Founding Member signups and manage early supporters.
-</p>
-""", unsafe_allow_html=True)
+st.markdown(_INTRO_HTML, unsafe_allow_html=True)
 
 # ===== Stats Overview =====
 total_members = len(members)
 spots_remaining = max(0, MAX_FOUNDING_MEMBERS - total_members)
-active_members = len([m for m in members if m.get('status', 'active') == 'active'])
-in_free_period = len([m for m in members if calculate_free_months_remaining(m.get('signupDate', '')) > 0])
+active_members = sum(1 for m in members if m.get('status', 'active') == 'active')
+
+# Binary search on sorted signup strings instead of a free-months
+# computation per member; members without a date count as free, same as
+# calculate_free_months_remaining's fallback
+signup_dates = sorted(d for m in members if (d := m.get('signupDate')))
+in_free_period = total_members - bisect_left(signup_dates, _FREE_CUTOFF_ISO)
 
 col1, col2, col3, col4 = st.columns(4)
 
@@ -94,19 +242,11 @@ st.markdown("<br>", unsafe_allow_html=True)
 progress_pct = (total_members / MAX_FOUNDING_MEMBERS) * 100
 progress_color = COLORS['positive'] if progress_pct < 50 else COLORS['warning'] if progress_pct < 80 else COLORS['negative']
 
-st.markdown(f"""
-<div style="margin-bottom: 30px;">
-    <div style="display: flex; justify-content: space-between; margin-bottom: 8px;">
-        <span style="color: {COLORS['text_muted']}; font-size: 0.9rem;">Founding Member Spots Filled</span>
-        <span style="color: {COLORS['gold']}; font-weight: 600;">{total_members}/{MAX_FOUNDING_MEMBERS}</span>
-    </div>
-    <div style="background: {COLORS['bg_dark']}; border-radius: 10px; height: 12px; overflow: hidden;">
-        <div style="background: linear-gradient(90deg, {COLORS['gold']}, {progress_color});
-                    width: {progress_pct}%; height: 100%; border-radius: 10px;
-                    transition: width 0.3s ease;"></div>
-    </div>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(_PROGRESS_TMPL.format_map({
+    'total_members': total_members,
+    'progress_color': progress_color,
+    'progress_pct': progress_pct,
+}), unsafe_allow_html=True)
 
 # ===== Add New Member Manually =====
 section_header("Add Founding Member", "Manually add a new founding member")
@@ -129,12 +269,11 @@ with st.expander("➕ Add Member Manually", expanded=len(members) == 0):
     if st.button("Add Founding Member", type="primary"):
         if new_name and new_email:
             # Check for duplicates
-            existing = [m for m in st.session_state.founding_members if m.get('email') == new_email]
-            if existing:
+            if new_email in member_emails:
                 st.warning("A member with this email already exists!")
             else:
                 new_member = {
-                    "id": datetime.now().strftime("%Y%m%d%H%M%S"),
+                    "id": _next_member_id(),
                     "name": new_name,
                     "email": new_email,
                     "source": new_source,
@@ -145,7 +284,9 @@ with st.expander("➕ Add Member Manually", expanded=len(members) == 0):
                     "status": "active"
                 }
                 st.session_state.founding_members.append(new_member)
-                save_members(st.session_state.founding_members)
+                members_by_id[new_member['id']] = new_member
+                member_emails.add(new_email)
+                append_member(new_member)
                 st.success(f"Added {new_name} as a Founding Member!")
                 st.rerun()
         else:
@@ -179,17 +320,14 @@ if members:
             label_visibility="collapsed"
         )
 
-    # Apply filters
-    filtered_members = members
-
-    if search_query:
-        search_lower = search_query.lower()
-        filtered_members = [m for m in filtered_members
-                          if search_lower in m.get('name', '').lower()
-                          or search_lower in m.get('email', '').lower()]
-
-    if status_filter != "all":
-        filtered_members = [m for m in filtered_members if m.get('status', 'active') == status_filter]
+    # Apply filters — both predicates fused into one pass over members
+    search_lower = search_query.lower() if search_query else ''
+    filtered_members = [m for m in members
+                        if (not search_lower
+                            or search_lower in m.get('name', '').lower()
+                            or search_lower in m.get('email', '').lower())
+                        and (status_filter == "all"
+                             or m.get('status', 'active') == status_filter)]
 
     # Apply sorting
     if sort_order == "newest":
@@ -201,112 +339,102 @@ if members:
 
     st.markdown(f"<p style='color: {COLORS['text_muted']}; margin-bottom: 15px;'>Showing {len(filtered_members)} of {len(members)} members</p>", unsafe_allow_html=True)
 
-    # Member cards
+    # Member cards — all rows joined into a single markdown call, so the
+    # frontend gets one component instead of columns + markdown + button
+    # per member on every keystroke in the search box
+    html_parts = []
     for member in filtered_members:
         free_remaining = calculate_free_months_remaining(member.get('signupDate', ''))
         status = member.get('status', 'active')
-        status_color = COLORS['positive'] if status == 'active' else COLORS['warning'] if status == 'churned' else COLORS['gold']
+        status_color = _POSITIVE if status == 'active' else _WARNING if status == 'churned' else _GOLD
 
         signup_date = member.get('signupDate', '')[:10]
-        source_emoji = {
-            "landing_page": "🌐",
-            "twitter": "🐦",
-            "reddit": "📝",
-            "referral": "🤝",
-            "direct": "📧",
-            "other": "📌"
-        }.get(member.get('source', 'other'), "📌")
-
-        col1, col2 = st.columns([4, 1])
-
-        with col1:
-            st.markdown(f"""
-            <div style="background: {COLORS['bg_card']}; border: 1px solid {COLORS['steel']};
-                        border-left: 3px solid {COLORS['gold']}; border-radius: 8px;
-                        padding: 15px 20px; margin-bottom: 10px;">
-                <div style="display: flex; justify-content: space-between; align-items: start;">
-                    <div>
-                        <div style="color: {COLORS['text_primary']}; font-size: 1.1rem; font-weight: 600;">
-                            {member.get('name', 'Unknown')}
-                        </div>
-                        <div style="color: {COLORS['text_muted']}; font-size: 0.9rem; margin-top: 3px;">
-                            {member.get('email', 'No email')}
-                        </div>
-                        <div style="display: flex; gap: 15px; margin-top: 10px;">
-                            <span style="color: {COLORS['text_muted']}; font-size: 0.8rem;">
-                                {source_emoji} {member.get('source', 'unknown').replace('_', ' ').title()}
-                            </span>
-                            <span style="color: {COLORS['text_muted']}; font-size: 0.8rem;">
-                                📅 Joined {signup_date}
-                            </span>
-                            <span style="color: {COLORS['gold'] if free_remaining > 0 else COLORS['text_muted']}; font-size: 0.8rem;">
-                                {'🎁 ' + str(int(free_remaining)) + ' free months left' if free_remaining > 0 else '💳 Paying member'}
-                            </span>
-                        </div>
-                        {f'<div style="color: {COLORS[\"text_muted\"]}; font-size: 0.8rem; margin-top: 5px; font-style: italic;">{member.get(\"notes\", \"\")}</div>' if member.get('notes') else ''}
+        source_emoji = _SOURCE_EMOJI.get(member.get('source', 'other'), "📌")
+
+        if member.get('notes'):
+            notes_html = (
+                f'<div style="color: {_TEXT_MUTED}; font-size: 0.8rem; '
+                f'margin-top: 5px; font-style: italic;">{member.get("notes", "")}</div>'
+            )
+        else:
+            notes_html = ''
+
+        html_parts.append(f"""
+        <div style="background: {_BG_CARD}; border: 1px solid {_STEEL};
+                    border-left: 3px solid {_GOLD}; border-radius: 8px;
+                    padding: 15px 20px; margin-bottom: 10px;">
+            <div style="display: flex; justify-content: space-between; align-items: start;">
+                <div>
+                    <div style="color: {_TEXT_PRIMARY}; font-size: 1.1rem; font-weight: 600;">
+                        {member.get('name', 'Unknown')}
                     </div>
-                    <div style="display: flex; flex-direction: column; align-items: flex-end; gap: 5px;">
-                        <span style="background: {status_color}20; color: {status_color};
-                                    padding: 3px 10px; border-radius: 12px; font-size: 0.75rem;
-                                    text-transform: uppercase;">
-                            {status}
+                    <div style="color: {_TEXT_MUTED}; font-size: 0.9rem; margin-top: 3px;">
+                        {member.get('email', 'No email')}
+                    </div>
+                    <div style="display: flex; gap: 15px; margin-top: 10px;">
+                        <span style="color: {_TEXT_MUTED}; font-size: 0.8rem;">
+                            {source_emoji} {member.get('source', 'unknown').replace('_', ' ').title()}
+                        </span>
+                        <span style="color: {_TEXT_MUTED}; font-size: 0.8rem;">
+                            📅 Joined {signup_date}
+                        </span>
+                        <span style="color: {_GOLD if free_remaining > 0 else _TEXT_MUTED}; font-size: 0.8rem;">
+                            {'🎁 ' + str(int(free_remaining)) + ' free months left' if free_remaining > 0 else '💳 Paying member'}
                         </span>
                     </div>
+                    {notes_html}
+                </div>
+                <div style="display: flex; flex-direction: column; align-items: flex-end; gap: 5px;">
+                    <span style="background: {status_color}20; color: {status_color};
+                                padding: 3px 10px; border-radius: 12px; font-size: 0.75rem;
+                                text-transform: uppercase;">
+                        {status}
+                    </span>
                 </div>
             </div>
-            """, unsafe_allow_html=True)
-
-        with col2:
-            # Status toggle buttons
-            if status == 'active':
-                if st.button("Mark Churned", key=f"churn_{member['id']}", use_container_width=True):
-                    for m in st.session_state.founding_members:
-                        if m['id'] == member['id']:
-                            m['status'] = 'churned'
+        </div>
+        """)
+
+    st.markdown("\n".join(html_parts), unsafe_allow_html=True)
+
+    # One status-change control pair replaces a toggle button per row
+    if filtered_members:
+        sel_col, btn_col = st.columns([3, 1])
+
+        with sel_col:
+            selected_id = st.selectbox(
+                "Change member status",
+                options=[m.get('id') for m in filtered_members],
+                format_func=lambda mid: (
+                    f"{members_by_id[mid].get('name', 'Unknown')}"
+                    f" — {members_by_id[mid].get('status', 'active')}"
+                ),
+                label_visibility="collapsed"
+            )
+
+        with btn_col:
+            selected_member = members_by_id[selected_id]
+            selected_status = selected_member.get('status', 'active')
+            if selected_status == 'active':
+                if st.button("Mark Churned", use_container_width=True):
+                    selected_member['status'] = 'churned'
                     save_members(st.session_state.founding_members)
                     st.rerun()
-            elif status == 'churned':
-                if st.button("Reactivate", key=f"reactivate_{member['id']}", use_container_width=True):
-                    for m in st.session_state.founding_members:
-                        if m['id'] == member['id']:
-                            m['status'] = 'active'
+            elif selected_status == 'churned':
+                if st.button("Reactivate", use_container_width=True):
+                    selected_member['status'] = 'active'
                     save_members(st.session_state.founding_members)
                     st.rerun()
 
 else:
-    st.markdown(f"""
-    <div style="background: {COLORS['bg_card']}; border: 1px solid {COLORS['steel']};
-                border-radius: 8px; padding: 40px; text-align: center;">
-        <div style="font-size: 3rem; margin-bottom: 15px;">🏆</div>
-        <div style="color: {COLORS['text_primary']}; font-size: 1.2rem; margin-bottom: 10px;">
-            No Founding Members Yet
-        </div>
-        <div style="color: {COLORS['text_muted']};">
-            Founding members will appear here as they sign up through the landing page.
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_EMPTY_STATE_HTML, unsafe_allow_html=True)
 
 st.markdown("<br><br>", unsafe_allow_html=True)
 
 # ===== Import from Landing Page =====
 section_header("Import Data", "Sync with landing page localStorage data")
 
-st.markdown(f"""
-<div style="background: {COLORS['mahogany_dark']}; border: 1px solid {COLORS['steel']};
-            border-radius: 8px; padding: 20px; margin-bottom: 20px;">
-    <div style="color: {COLORS['gold']}; font-weight: 600; margin-bottom: 10px;">
-        📥 Import from Landing Page
-    </div>
-    <div style="color: {COLORS['text_muted']}; font-size: 0.9rem; margin-bottom: 15px;">
-        To import founding members from your landing page, open your browser's Developer Tools (F12) on the landing page,
-        go to Console, and run: <code style="background: {COLORS['bg_dark']}; padding: 2px 6px; border-radius: 4px;">
-        copy(localStorage.getItem('pbs_founding_members'))</code>
-        <br><br>
-        Then paste the JSON data below:
-    </div>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(_IMPORT_INFO_HTML, unsafe_allow_html=True)
 
 import_data = st.text_area("Paste JSON data here", placeholder='[{"name": "...", "email": "..."}, ...]', height=100)
 
@@ -316,15 +444,18 @@ if st.button("Import Members"):
             imported = json.loads(import_data)
             if isinstance(imported, list):
                 new_count = 0
+                # O(1) membership per imported row against the session
+                # email set instead of rescanning the member list
                 for member in imported:
-                    # Check for duplicates
-                    existing = [m for m in st.session_state.founding_members if m.get('email') == member.get('email')]
-                    if not existing and member.get('email'):
+                    email = member.get('email')
+                    if email and email not in member_emails:
                         # Ensure required fields
-                        member['id'] = member.get('id', datetime.now().strftime("%Y%m%d%H%M%S"))
+                        member['id'] = member.get('id') or _next_member_id()
                         member['source'] = member.get('source', 'landing_page')
                         member['status'] = member.get('status', 'active')
                         st.session_state.founding_members.append(member)
+                        members_by_id[member['id']] = member
+                        member_emails.add(email)
                         new_count += 1
 
                 save_members(st.session_state.founding_members)